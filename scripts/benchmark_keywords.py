@@ -0,0 +1,81 @@
+import sys
+import os
+import argparse
+import random
+import time
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from issue_selector import KEYWORD_GROUPS, KEYWORD_MATCHER
+from keyword_matcher import KeywordMatcher
+
+# Everyday news vocabulary; keywords are mixed in at KEYWORD_RATE
+FILLER = """
+the a an of and in on at to for with from by about after before over under into during
+said says reported told officials people year years week today yesterday new more most
+last first two three several many some other group report plan plans state city county
+local residents leaders lawmakers court judge vote voters campaign public private company
+companies workers families children police data according percent million billion since
+while would could should might will may also just still again however because which who
+what when where there their they them this that these those been being were was has have
+""".split()
+KEYWORD_RATE = 0.05
+
+
+def build_corpus(articles, words_per_article, seed=1):
+    rng = random.Random(seed)
+    keywords = sorted({kw for kws in KEYWORD_GROUPS.values() for kw in kws})
+    texts = []
+    for _ in range(articles):
+        words = [rng.choice(keywords) if rng.random() < KEYWORD_RATE else rng.choice(FILLER)
+                 for _ in range(words_per_article)]
+        texts.append(" ".join(words))
+    return texts
+
+
+def per_keyword_loop(text):
+    # What filter_articles did before KeywordMatcher: one substring scan per keyword, per group
+    return {name for name, kws in KEYWORD_GROUPS.items() if any(kw in text for kw in kws)}
+
+
+def timed(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time KeywordMatcher against the per-keyword loop it replaced.")
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=40, help="words per article")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    texts = build_corpus(args.articles, args.words)
+    substring_matcher = KeywordMatcher(KEYWORD_GROUPS)
+    baseline = timed(per_keyword_loop, texts, args.repeat)
+    variants = {
+        "substring match_groups": timed(substring_matcher.match_groups, texts, args.repeat),
+        "whole-word group_counts": timed(KEYWORD_MATCHER.group_counts, texts, args.repeat),
+    }
+
+    print(f"⏱️ {args.articles} articles x {args.words} words, best of {args.repeat}")
+    print(f"  per-keyword any() loop: {baseline:.3f}s")
+    for name, seconds in variants.items():
+        print(f"  {name}: {seconds:.3f}s ({baseline / seconds:.1f}x)")
+
+    slower = [name for name, seconds in variants.items() if seconds >= baseline]
+    if slower:
+        print(f"❌ Slower than the per-keyword loop: {', '.join(slower)}")
+        return 1
+    print("✅ KeywordMatcher beats the per-keyword loop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
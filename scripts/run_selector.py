@@ -1,81 +1,186 @@
 import sys
 import os
+import argparse
+import asyncio
 
 # Add the src directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from news_api import fetch_trending_articles
+from news_api import fetch_article_pages, fetch_stored_articles
 from issue_selector import filter_articles
-from llm_generator import generate_llm_output
+from llm_generator import generate_llm_output, parse_stats, run_async, stream_llm_output_async
+from live_render import LiveSections, PartialJsonStrings
+from email_index import example_provider
+from local_classifier import LocalClassifier, Prefilter
+
+def _print_article(i, article):
+    title = article.get('title') or ''
+    desc = article.get('description') or ''
+    source = article.get('source_id', '')
+    pub_date = article.get('pubDate', '')
+    url = article.get('url', '')
+
+    print(f"\n{i+1}. 🗞️ Title: {title}")
+    print(f"   📃 Description: {desc}")
+    print(f"   🏷️ Source: {source} | 📅 Published: {pub_date}")
+    print(f"   🔗 URL: {url}")
+
+def _draft_text(fields):
+    """The draft as printed; also used for partial drafts, whose fields fill in order."""
+    lines = []
+    if "issue" in fields:
+        lines.append(f"   🧭 Issue: {fields['issue']}")
+    if "local_stat" in fields:
+        lines.append(f"   📊 Local Impact: {fields['local_stat']}")
+    if "email" in fields:
+        lines.append(f"\n   📬 Donor Email:\n{fields['email']}")
+    return "\n".join(lines)
+
+def _print_llm_result(llm_result):
+    if "error" in llm_result:
+        print(f"   ❌ LLM Error: {llm_result['error']}")
+        print(f"   🔧 Raw Output: {llm_result.get('raw', 'N/A')}")
+    else:
+        print(_draft_text(llm_result) + "\n")
+
+async def _stream_one(article, examples, on_text, due=None):
+    """
+    Stream one draft, calling on_text with the rendered partial draft whenever
+    due() allows (every delta by default); returns the final result.
+    """
+    parser = PartialJsonStrings()
+    async for piece in stream_llm_output_async(article, examples=examples):
+        if isinstance(piece, dict):
+            return piece
+        parser.feed(piece)
+        if due is None or due():
+            on_text(_draft_text(parser.fields))
+    return {"error": "Stream ended without a result."}
+
+async def _stream_sequentially(articles, examples):
+    # No cursor control (output piped to a file) or a terminal too short for every section:
+    # print each draft as it grows, one article at a time
+    for i, (article, article_examples) in enumerate(zip(articles, examples)):
+        _print_article(i, article)
+        printed = ""
+
+        def on_text(text):
+            nonlocal printed
+            if text.startswith(printed):
+                sys.stdout.write(text[len(printed):])
+                sys.stdout.flush()
+                printed = text
+
+        llm_result = await _stream_one(article, article_examples, on_text)
+        final = "" if "error" in llm_result else _draft_text(llm_result)
+        if printed and final.startswith(printed):
+            print(final[len(printed):] + "\n")
+        else:
+            if printed:
+                print()
+            _print_llm_result(llm_result)
+
+async def _stream_concurrently(articles, examples):
+    # Every draft streams at once into its own live section; full results are printed once all finish
+    live = LiveSections([f"{i+1}. 🗞️ {a.get('title') or ''}" for i, a in enumerate(articles)])
+
+    async def run(i, article):
+        llm_result = await _stream_one(article, examples[i], lambda text: live.update(i, text), due=live.due)
+        live.update(i, _draft_text(llm_result) if "error" not in llm_result else llm_result["error"], done=True)
+        return llm_result
+
+    try:
+        results = await asyncio.gather(*(run(i, a) for i, a in enumerate(articles)))
+    finally:
+        live.finish()
+    for i, (article, llm_result) in enumerate(zip(articles, results)):
+        _print_article(i, article)
+        _print_llm_result(llm_result)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preview today's relevant articles and fundraising drafts.")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the on-disk LLM response cache")
+    parser.add_argument(
+        "--prefilter-model",
+        help="local classifier (see local_classifier.py train); articles it is confident are off-message are not drafted",
+    )
+    parser.add_argument("--min-confidence", type=float, default=0.9, help="prefilter confidence needed to drop an article")
+    parser.add_argument(
+        "--store", action="store_true",
+        help="sync only new articles into the local article store and select from it",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="show drafts as they are written; all articles stream at once on a terminal, one by one otherwise",
+    )
+    parser.add_argument(
+        "--few-shot", type=int, default=0, metavar="K",
+        help="include the K most similar past campaign emails in each drafting prompt (see email_index.py)",
+    )
+    args = parser.parse_args(argv)
+    if args.no_cache:
+        os.environ["LLM_CACHE_DISABLED"] = "1"
 
-def main():
     filtered_articles = []
     seen_content = set()
-    iteration_count = 0
-    max_iterations = 4
+    max_pages = 4
 
-    while len(filtered_articles) < 4 and iteration_count < max_iterations:
-        data = fetch_trending_articles()
+    if args.store:
+        data = fetch_stored_articles(max_pages * 10)
         articles = data.get("results", [])
-        iteration_count += 1
-        print(f"\n📰 Received {len(articles)} articles from API (Page {iteration_count} of {max_iterations})")
-
-        if len(articles) == 0:
-            print("⚠️ API response:", data)
-            break
-
-        if articles:
-            sample_title = articles[0].get('title') or ''
-            sample_desc = articles[0].get('description') or ''
-            sample_url = articles[0].get('url', '')
-            print("\n🔎 Sample article:")
-            print(f"Title: {sample_title}")
-            print(f"Description: {sample_desc}")
-            print(f"URL: {sample_url}")
-            print(f"Source: {articles[0].get('source_id')}")
-
-        new_filtered = filter_articles(articles)
-        for article in new_filtered:
-            if len(filtered_articles) >= 4:
-                break  # Cap at 4
-
-            title = article.get('title') or ''
-            desc = article.get('description') or ''
-            content_key = (title.lower(), desc.lower())
-
-            if content_key not in seen_content:
-                filtered_articles.append(article)
-                seen_content.add(content_key)
-
-        if len(filtered_articles) < 4:
-            if iteration_count >= max_iterations:
-                print(f"\n⛔ Reached max API calls ({max_iterations}).")
-                break
-            print(f"\n🔁 Only found {len(filtered_articles)} relevant articles. Fetching more...")
-
-    print(f"\n✅ Found {len(filtered_articles)} relevant articles:\n")
+        print(f"\n📰 Loaded {len(articles)} newest articles from the local store")
+    else:
+        # All pages are requested concurrently in a single round trip
+        data = fetch_article_pages(1, max_pages)
+        articles = data.get("results", [])
+        print(f"\n📰 Received {len(articles)} articles from API ({max_pages} pages)")
+
+    if len(articles) == 0:
+        print("⚠️ API response:", data)
+
+    if articles:
+        sample_title = articles[0].get('title') or ''
+        sample_desc = articles[0].get('description') or ''
+        sample_url = articles[0].get('url', '')
+        print("\n🔎 Sample article:")
+        print(f"Title: {sample_title}")
+        print(f"Description: {sample_desc}")
+        print(f"URL: {sample_url}")
+        print(f"Source: {articles[0].get('source_id')}")
+
+    prefilter = Prefilter(LocalClassifier.load(args.prefilter_model), args.min_confidence) if args.prefilter_model else None
+    new_filtered = filter_articles(articles, prefilter)
+    if prefilter:
+        print(f"🧠 Prefilter dropped {prefilter.local} articles locally; {prefilter.remote} went on to the LLM")
+    for article in new_filtered:
+        if len(filtered_articles) >= 4:
+            break  # Cap at 4
 
-    for i, article in enumerate(filtered_articles):
         title = article.get('title') or ''
         desc = article.get('description') or ''
-        source = article.get('source_id', '')
-        pub_date = article.get('pubDate', '')
-        url = article.get('url', '')
+        content_key = (title.lower(), desc.lower())
+
+        if content_key not in seen_content:
+            filtered_articles.append(article)
+            seen_content.add(content_key)
 
-        print(f"\n{i+1}. 🗞️ Title: {title}")
-        print(f"   📃 Description: {desc}")
-        print(f"   🏷️ Source: {source} | 📅 Published: {pub_date}")
-        print(f"   🔗 URL: {url}")
+    print(f"\n✅ Found {len(filtered_articles)} relevant articles:\n")
 
-        llm_result = generate_llm_output(article)
+    examples_for = example_provider(args.few_shot) if filtered_articles else None
+    examples = [examples_for(a) if examples_for else None for a in filtered_articles]
 
-        if "error" in llm_result:
-            print(f"   ❌ LLM Error: {llm_result['error']}")
-            print(f"   🔧 Raw Output: {llm_result.get('raw', 'N/A')}")
+    if args.stream and filtered_articles:
+        if sys.stdout.isatty() and LiveSections.fits(len(filtered_articles)):
+            run_async(_stream_concurrently(filtered_articles, examples))
         else:
-            print(f"   🧭 Issue: {llm_result['issue']}")
-            print(f"   📊 Local Impact: {llm_result['local_stat']}")
-            print(f"\n   📬 Donor Email:\n{llm_result['email']}\n")
+            run_async(_stream_sequentially(filtered_articles, examples))
+    else:
+        for i, (article, article_examples) in enumerate(zip(filtered_articles, examples)):
+            _print_article(i, article)
+            _print_llm_result(generate_llm_output(article, examples=article_examples))
+
+    if parse_stats.replies:
+        print(f"🧾 Draft parsing: {parse_stats.summary()}")
 
 if __name__ == "__main__":
     main()
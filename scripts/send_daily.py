@@ -1,6 +1,8 @@
 # scripts/send_daily.py
 import sys
 import os
+import argparse
+import asyncio
 import smtplib
 import ssl
 from datetime import date
@@ -23,12 +25,45 @@ else:
 # Make src/ importable
 sys.path.append(os.path.join(repo_root, "src"))
 
-from news_api import fetch_trending_articles
+from news_api import fetch_article_pages, fetch_stored_articles
 from issue_selector import filter_articles
-from llm_generator import generate_llm_output
+from llm_generator import (
+    DEFAULT_LOCATION,
+    LOCALIZE_CONCURRENCY,
+    generate_llm_output,
+    generate_llm_output_async,
+    generate_localized_outputs,
+    parse_stats,
+    run_async,
+)
+from email_index import example_provider
+from local_classifier import LocalClassifier, Prefilter
+from story_triage import TRIAGE_MODEL, rank_candidates
+from smtp_pool import DEFAULT_CONNECTIONS, BulkSender, OutgoingEmail, SMTPSettings, read_recipients
 
+# Candidates drafted at most; the two-stage pipeline ranks all of them first
+MAX_DRAFT_CANDIDATES = 4
 
-def _choose_story_with_email(articles):
+
+def _is_clean(llm):
+    return isinstance(llm, dict) and "error" not in llm and llm.get("email")
+
+
+def _pick_fallback(fallbacks):
+    if fallbacks:
+        for art, llm in fallbacks:
+            if isinstance(llm, dict) and llm.get("email"):
+                return art, llm
+        return fallbacks[0]
+
+    return None, None
+
+
+def _examples(examples_for, article):
+    return examples_for(article) if examples_for else None
+
+
+def _choose_story_with_email(articles, examples_for=None):
     """
     For each filtered article, ask the LLM for fundraising output.
     Pick the first one that parses cleanly.
@@ -36,18 +71,43 @@ def _choose_story_with_email(articles):
     """
     fallbacks = []
     for art in articles:
-        llm = generate_llm_output(art)
-        if isinstance(llm, dict) and "error" not in llm and llm.get("email"):
+        llm = generate_llm_output(art, examples=_examples(examples_for, art))
+        if _is_clean(llm):
             return art, llm
         fallbacks.append((art, llm))
 
-    if fallbacks:
-        for art, llm in fallbacks:
-            if isinstance(llm, dict) and llm.get("email"):
+    return _pick_fallback(fallbacks)
+
+
+async def _draft_with_examples_async(article, examples_for=None):
+    # Retrieval makes a blocking embeddings request, so it runs in a thread to keep the drafts concurrent
+    examples = await asyncio.to_thread(examples_for, article) if examples_for else None
+    return await generate_llm_output_async(article, examples=examples)
+
+
+async def _choose_story_with_email_async(articles, examples_for=None):
+    """
+    Same selection as _choose_story_with_email, but every article's LLM call
+    starts at once. Results are still checked in article order, and the calls
+    still in flight are cancelled as soon as a winner is known.
+    """
+    tasks = [
+        asyncio.create_task(_draft_with_examples_async(art, examples_for))
+        for art in articles
+    ]
+    fallbacks = []
+    try:
+        for art, task in zip(articles, tasks):
+            llm = await task
+            if _is_clean(llm):
                 return art, llm
-        return fallbacks[0]
+            fallbacks.append((art, llm))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-    return None, None
+    return _pick_fallback(fallbacks)
 
 
 def _build_email_parts(article, llm_result):
@@ -142,48 +202,167 @@ def _send_email(subject, text_body, html_body):
         server.sendmail(sender, to_addrs, msg.as_string())
 
 
-def _collect_up_to_four():
+def _localized_drafts(article, llm, locations, concurrency, examples=None):
+    """
+    Draft the chosen article once per recipient location, concurrently.
+    The draft made during selection is reused for the default location,
+    and its issue is shared with every other location's draft.
+    """
+    others = sorted(set(locations) - {DEFAULT_LOCATION})
+    drafts = {DEFAULT_LOCATION: llm}
+    if others:
+        print(f"🌎 Drafting {len(others)} localized variants ({concurrency} at a time)...")
+        drafts.update(generate_localized_outputs(
+            article, others, issue=llm.get("issue"), examples=examples, max_concurrency=concurrency,
+        ))
+    return drafts
+
+
+def _send_to_recipients(article, llm, recipients_csv, connections, draft_concurrency=LOCALIZE_CONCURRENCY,
+                        examples=None):
+    """
+    Send every recipient in the CSV a digest localized to their `location`
+    column, over a pool of reused SMTP sessions. Returns the exit code.
+    """
+    recipients = read_recipients(recipients_csv)
+    if not recipients:
+        print(f"⛔ No recipients with an email address in {recipients_csv}; not sending.")
+        return 4
+
+    for r in recipients:
+        r["location"] = r.get("location") or DEFAULT_LOCATION
+    drafts = _localized_drafts(article, llm, [r["location"] for r in recipients], draft_concurrency, examples)
+    parts = {}
+    for location, draft in drafts.items():
+        if _is_clean(draft):
+            parts[location] = _build_email_parts(article, draft)
+        else:
+            print(f"⚠️ No usable draft for {location}; its recipients are skipped.")
+
+    emails = [
+        OutgoingEmail(r["email"], *parts[r["location"]], name=r.get("name") or None)
+        for r in recipients if r["location"] in parts
+    ]
+    skipped = len(recipients) - len(emails)
+    print(f"📬 Sending {len(emails)} emails ({len(parts)} locations) over up to {connections} SMTP connections...")
+    try:
+        report = BulkSender(SMTPSettings.from_env(), connections).send_all(emails)
+    except Exception as e:
+        print(f"🛑 Email send failed: {e}")
+        return 4
+
+    print(f"📊 {report.summary()}")
+    for recipient, error in report.failed[:10]:
+        print(f"  ↳ {recipient}: {error}")
+    if report.failed or skipped:
+        print(f"⛔ {len(report.failed) + skipped} of {len(recipients)} recipients did not get their email.")
+        return 4
+    return 0
+
+
+def _collect_candidates(use_store=False, prefilter=None):
     """
-    Fetch up to 4 relevant articles (like run_selector.py).
+    Fetch every relevant article, without content duplicates, in feed order.
+    All pages are requested concurrently in a single round trip, or with
+    use_store, only new articles are synced and the rest come from the local store.
     """
     filtered_articles = []
     seen_content = set()
-    iteration_count = 0
-    max_iterations = 4
-
-    while len(filtered_articles) < 4 and iteration_count < max_iterations:
-        data = fetch_trending_articles()
-        articles = data.get("results", [])
-        iteration_count += 1
-
-        if not articles:
-            break
-
-        new_filtered = filter_articles(articles)
-        for article in new_filtered:
-            if len(filtered_articles) >= 4:
-                break
-            title = article.get('title') or ''
-            desc = article.get('description') or ''
-            key = (title.lower(), (desc or '').lower())
-            if key not in seen_content:
-                filtered_articles.append(article)
-                seen_content.add(key)
+    max_pages = 4
+
+    data = fetch_stored_articles(max_pages * 10) if use_store else fetch_article_pages(1, max_pages)
+    articles = data.get("results", [])
+    if not articles:
+        return filtered_articles
+
+    for article in filter_articles(articles, prefilter):
+        title = article.get('title') or ''
+        desc = article.get('description') or ''
+        key = (title.lower(), (desc or '').lower())
+        if key not in seen_content:
+            filtered_articles.append(article)
+            seen_content.add(key)
 
     return filtered_articles
 
 
-def main():
-    articles = _collect_up_to_four()
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pick today's story and email the fundraising draft.")
+    parser.add_argument(
+        "--pipeline", choices=["sync", "async", "two-stage"], default="sync",
+        help="async drafts all candidate articles concurrently; two-stage ranks candidates with a cheap "
+             "model first and drafts only the best one (default: sync, one at a time)",
+    )
+    parser.add_argument(
+        "--triage-model", default=TRIAGE_MODEL,
+        help="model that ranks candidates against the priority issues (two-stage pipeline)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="bypass the on-disk LLM response cache")
+    parser.add_argument(
+        "--few-shot", type=int, default=0, metavar="K",
+        help="include the K most similar past campaign emails in each drafting prompt (see email_index.py)",
+    )
+    parser.add_argument(
+        "--prefilter-model",
+        help="local classifier (see local_classifier.py train); articles it is confident are off-message are not drafted",
+    )
+    parser.add_argument("--min-confidence", type=float, default=0.9, help="prefilter confidence needed to drop an article")
+    parser.add_argument(
+        "--store", action="store_true",
+        help="sync only new articles into the local article store and select from it",
+    )
+    parser.add_argument(
+        "--recipients",
+        help="CSV of recipients (email, optional location and display-name columns); each gets a digest for their location "
+             "instead of the single EMAIL_RECIPIENT send",
+    )
+    parser.add_argument(
+        "--smtp-connections", type=int, default=DEFAULT_CONNECTIONS,
+        help="SMTP sessions kept open in parallel when sending to --recipients",
+    )
+    parser.add_argument(
+        "--draft-concurrency", type=int, default=LOCALIZE_CONCURRENCY,
+        help="localized drafts requested at once when --recipients spans several locations",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.no_cache:
+        os.environ["LLM_CACHE_DISABLED"] = "1"
+
+    prefilter = Prefilter(LocalClassifier.load(args.prefilter_model), args.min_confidence) if args.prefilter_model else None
+    articles = _collect_candidates(args.store, prefilter)
+    if prefilter:
+        print(f"🧠 Prefilter dropped {prefilter.local} articles locally; {prefilter.remote} went on to the LLM")
     if not articles:
         print("⛔ No relevant articles found today; not sending an email.")
         return 2
 
-    article, llm = _choose_story_with_email(articles)
+    if args.pipeline == "two-stage":
+        # Every candidate is ranked; drafting stops at the first clean draft, so usually only the top one is drafted
+        print(f"🔎 Ranking {len(articles)} candidates with {args.triage_model}...")
+        articles = rank_candidates(articles, model=args.triage_model)
+    articles = articles[:MAX_DRAFT_CANDIDATES]
+
+    examples_for = example_provider(args.few_shot)
+    if args.pipeline == "async":
+        article, llm = run_async(_choose_story_with_email_async(articles, examples_for))
+    else:
+        article, llm = _choose_story_with_email(articles, examples_for)
+    if parse_stats.replies:
+        print(f"🧾 Draft parsing: {parse_stats.summary()}")
     if not article or not isinstance(llm, dict) or not llm.get("email"):
         print("⛔ Could not generate a usable fundraising email; not sending.")
         return 3
 
+    if args.recipients:
+        return _send_to_recipients(
+            article, llm, args.recipients, args.smtp_connections, args.draft_concurrency,
+            _examples(examples_for, article),
+        )
+
     subject, text_body, html_body = _build_email_parts(article, llm)
 
     try:
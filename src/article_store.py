@@ -0,0 +1,137 @@
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_STORE_PATH = os.path.join(REPO_ROOT, ".cache", "articles.sqlite3")
+# Columns in the same order and shape as news_api article dicts
+ARTICLE_FIELDS = ("url", "title", "description", "full_text", "source_id", "pubDate")
+
+
+class ArticleStore:
+    """
+    On-disk SQLite store of every article fetched from the news API.
+
+    Articles are keyed by URL (re-fetching one updates it in place) and
+    indexed by publication date, so the newest stored date can drive
+    incremental syncs and history can be read back for backfills and analytics.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT NOT NULL,
+                title TEXT NOT NULL DEFAULT '',
+                description TEXT NOT NULL DEFAULT '',
+                full_text TEXT NOT NULL DEFAULT '',
+                source_id TEXT NOT NULL DEFAULT '',
+                pub_date TEXT NOT NULL DEFAULT '',
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_url ON articles (url)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_pub_date ON articles (pub_date)")
+        self._conn.commit()
+
+    def add(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """Insert or refresh articles (those without a URL are skipped); returns how many were new."""
+        now = time.time()
+        rows = [
+            (a["url"], a.get("title") or "", a.get("description") or "", a.get("full_text") or "",
+             a.get("source_id") or "", a.get("pubDate") or "", now)
+            for a in articles if a.get("url")
+        ]
+        with self._lock:
+            before = self._count()
+            self._conn.executemany(
+                """
+                INSERT INTO articles (url, title, description, full_text, source_id, pub_date, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    title = excluded.title, description = excluded.description, full_text = excluded.full_text,
+                    source_id = excluded.source_id, pub_date = excluded.pub_date, fetched_at = excluded.fetched_at
+                """,
+                rows,
+            )
+            self._conn.commit()
+            return self._count() - before
+
+    def latest_pub_date(self) -> Optional[str]:
+        """Newest stored webPublicationDate (ISO 8601), or None for an empty store."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(pub_date) FROM articles WHERE pub_date != ''").fetchone()
+        return row[0]
+
+    def recent(self, limit: int = 40, since: Optional[str] = None) -> List[Dict[str, str]]:
+        """Newest articles first, optionally only those published on or after `since`."""
+        query = "SELECT url, title, description, full_text, source_id, pub_date FROM articles"
+        params: List[Any] = []
+        if since:
+            query += " WHERE pub_date >= ?"
+            params.append(since)
+        query += " ORDER BY pub_date DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(ARTICLE_FIELDS, row)) for row in rows]
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, first, last = self._conn.execute(
+                "SELECT COUNT(*), MIN(pub_date), MAX(pub_date) FROM articles"
+            ).fetchone()
+        return {"articles": count, "earliest": first, "latest": last}
+
+
+_store: Optional[ArticleStore] = None
+
+
+def get_store() -> ArticleStore:
+    """Process-wide store, opened on first use at ARTICLE_STORE_PATH (default .cache/ in the repo)."""
+    global _store
+    if _store is None:
+        _store = ArticleStore(os.getenv("ARTICLE_STORE_PATH", DEFAULT_STORE_PATH))
+    return _store
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from news_api import DEFAULT_SYNC_PAGES, sync_articles
+
+    parser = argparse.ArgumentParser(description="Sync and inspect the local article store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="fetch articles newer than the latest stored one")
+    sync.add_argument("--max-pages", type=int, default=DEFAULT_SYNC_PAGES)
+    backfill = sub.add_parser("backfill", help="fetch everything published since a date")
+    backfill.add_argument("--from-date", required=True, help="YYYY-MM-DD")
+    backfill.add_argument("--max-pages", type=int, default=50)
+    sub.add_parser("stats", help="print how much history the store holds")
+    args = parser.parse_args(argv)
+
+    store = get_store()
+    synced = 0
+    if args.command == "sync":
+        synced = sync_articles(store, max_pages=args.max_pages)
+    elif args.command == "backfill":
+        synced = sync_articles(store, from_date=args.from_date, max_pages=args.max_pages)
+    stats = store.stats()
+    print(f"🗄️ {stats['articles']} articles in {store.path} ({stats['earliest'] or '-'} → {stats['latest'] or '-'})")
+    if synced is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
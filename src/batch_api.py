@@ -0,0 +1,122 @@
+"""
+Helpers for the OpenAI Batch API: write chat-completion requests to a JSONL
+file, submit it, poll until it finishes and read the replies back.
+
+The client's base URL comes from OPENAI_BASE_URL like any other OpenAI call,
+so the whole flow can be exercised against a local stub server.
+"""
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from openai import OpenAI
+
+ENDPOINT = "/v1/chat/completions"
+# The Batch API accepts at most 50,000 requests per input file
+MAX_REQUESTS_PER_BATCH = 50_000
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# (custom_id, chat messages)
+BatchRequest = Tuple[str, List[Dict[str, str]]]
+
+
+def write_batch_file(requests: Iterable[BatchRequest], path: str, model: str, temperature: float = 0,
+                     response_format: Optional[Dict[str, Any]] = None) -> int:
+    """Write one Batch API request per line; returns the number of requests written."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, messages in requests:
+            body: Dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+            if response_format:
+                body["response_format"] = response_format
+            line = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": ENDPOINT,
+                "body": body,
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def submit_batch(api_client: OpenAI, path: str) -> str:
+    with open(path, "rb") as f:
+        uploaded = api_client.files.create(file=f, purpose="batch")
+    batch = api_client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint=ENDPOINT,
+        completion_window="24h",
+    )
+    print(f"📤 Submitted batch {batch.id} ({path})")
+    return batch.id
+
+
+def wait_for_batch(api_client: OpenAI, batch_id: str, poll_interval: float = 30.0) -> Any:
+    while True:
+        batch = api_client.batches.retrieve(batch_id)
+        counts = getattr(batch, "request_counts", None)
+        if counts is not None:
+            print(f"⏳ Batch {batch_id}: {batch.status} ({counts.completed}/{counts.total} done)")
+        else:
+            print(f"⏳ Batch {batch_id}: {batch.status}")
+        if batch.status in TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def iter_batch_output(api_client: OpenAI, batch: Any) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (custom_id, reply text) for every request; reply is None when the request failed."""
+    for file_id in (batch.output_file_id, getattr(batch, "error_file_id", None)):
+        if not file_id:
+            continue
+        for line in api_client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            if response.get("status_code") == 200 and body.get("choices"):
+                yield record["custom_id"], body["choices"][0]["message"]["content"]
+            else:
+                yield record["custom_id"], None
+
+
+def run_batches(
+    api_client: OpenAI,
+    requests: Iterable[BatchRequest],
+    model: str,
+    workdir: str,
+    temperature: float = 0,
+    poll_interval: float = 30.0,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Split requests into Batch API input files of at most MAX_REQUESTS_PER_BATCH,
+    submit them all, wait for every batch and return {custom_id: reply text}.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    batch_ids: List[str] = []
+    chunk: List[BatchRequest] = []
+
+    def flush() -> None:
+        path = os.path.join(workdir, f"batch_input_{len(batch_ids):04d}.jsonl")
+        write_batch_file(chunk, path, model, temperature, response_format)
+        batch_ids.append(submit_batch(api_client, path))
+        chunk.clear()
+
+    for request in requests:
+        chunk.append(request)
+        if len(chunk) >= MAX_REQUESTS_PER_BATCH:
+            flush()
+    if chunk:
+        flush()
+
+    replies: Dict[str, Optional[str]] = {}
+    for batch_id in batch_ids:
+        batch = wait_for_batch(api_client, batch_id, poll_interval)
+        if batch.status != "completed":
+            print(f"❌ Batch {batch_id} ended with status '{batch.status}'")
+        replies.update(iter_batch_output(api_client, batch))
+    return replies
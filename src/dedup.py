@@ -0,0 +1,119 @@
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Sequence, Set, Tuple
+
+# MinHash / LSH parameters: 16 bands x 4 rows finds pairs with Jaccard ~0.5+
+# as candidates; candidates are then confirmed against the exact threshold.
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    # Deterministic (a, b) pairs so signatures are stable across runs
+    perms = []
+    for i in range(num_perm):
+        digest = hashlib.sha256(f"minhash-{i}".encode()).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:16], "big") % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+
+_PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form for duplicate detection: NFKC folds the "𝐛𝐨𝐥𝐝" Unicode
+    letters back to ASCII, then case, punctuation and whitespace are dropped.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    words = normalized.split()
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(shingle_set: Set[str]) -> Tuple[int, ...]:
+    base = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big") for s in shingle_set]
+    return tuple(
+        min(((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in base)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def cluster_texts(texts: Sequence[str], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """
+    Group exact and near-duplicate texts.
+
+    Exact duplicates (same normalized text) are merged by hash; the remaining
+    unique texts are bucketed with MinHash LSH and merged when their shingle
+    Jaccard similarity is at least `threshold`. Returns clusters of indices
+    into `texts`, each ordered by index, in order of their first member.
+    """
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # Exact duplicates
+    first_by_hash: Dict[str, int] = {}
+    normalized: Dict[int, str] = {}
+    for i, text in enumerate(texts):
+        norm = normalize_text(text)
+        key = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        if key in first_by_hash:
+            union(first_by_hash[key], i)
+        else:
+            first_by_hash[key] = i
+            normalized[i] = norm
+
+    # Near duplicates among the unique texts
+    shingle_sets = {i: shingles(norm) for i, norm in normalized.items()}
+    rows = NUM_PERM // BANDS
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for i, shingle_set in shingle_sets.items():
+        signature = minhash_signature(shingle_set)
+        for band in range(BANDS):
+            buckets.setdefault((band, signature[band * rows:(band + 1) * rows]), []).append(i)
+
+    checked: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pair = (members[x], members[y])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if jaccard(shingle_sets[pair[0]], shingle_sets[pair[1]]) >= threshold:
+                    union(*pair)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
@@ -0,0 +1,73 @@
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+
+from donor_scoring import ACTION_CODES, CTA_CODES
+
+# One flat little-endian file per column: 10 bytes per event in total.
+# Actions and CTAs are small-int codes (see donor_scoring.ACTION_CODES /
+# CTA_CODES) and dates are day ordinals (date.toordinal()).
+COLUMNS = {
+    "donor_id": np.dtype("<u4"),
+    "day": np.dtype("<i4"),
+    "action": np.dtype("u1"),
+    "cta": np.dtype("u1"),
+}
+
+
+class DonorEventStore:
+    """
+    Append-only columnar donor event history backed by memory-mapped files.
+
+    columns() maps the files read-only without copying, so a scoring job can
+    open a 100M-event history instantly and let the OS page in what it touches.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def __len__(self) -> int:
+        # A crash mid-append can leave columns of different lengths; only full rows count
+        lengths = []
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            lengths.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(lengths)
+
+    def append(self, donor_ids, days, action_codes, cta_codes) -> None:
+        values = {"donor_id": donor_ids, "day": days, "action": action_codes, "cta": cta_codes}
+        arrays = {name: np.asarray(values[name]).astype(dtype, copy=False) for name, dtype in COLUMNS.items()}
+        if len({len(a) for a in arrays.values()}) != 1:
+            raise ValueError("All event columns must have the same length")
+
+        n = len(self)
+        for name, array in arrays.items():
+            with open(self._column_path(name), "r+b" if os.path.exists(self._column_path(name)) else "wb") as f:
+                # Drop any partial tail from an interrupted append before writing
+                f.truncate(n * COLUMNS[name].itemsize)
+                f.seek(0, os.SEEK_END)
+                array.tofile(f)
+
+    def append_history(self, donor_id: int, donor_history: List[Dict[str, Any]]) -> None:
+        """Append email_test-style event dicts ({"date", "action", "cta"}) for one donor."""
+        self.append(
+            np.full(len(donor_history), donor_id),
+            [e["date"].toordinal() for e in donor_history],
+            [ACTION_CODES[e["action"]] for e in donor_history],
+            [CTA_CODES[e["cta"]] for e in donor_history],
+        )
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Read-only, zero-copy views of every column."""
+        n = len(self)
+        if n == 0:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return {
+            name: np.memmap(self._column_path(name), dtype=dtype, mode="r", shape=(n,))
+            for name, dtype in COLUMNS.items()
+        }
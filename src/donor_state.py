@@ -0,0 +1,92 @@
+from datetime import date, datetime
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from donor_events import DonorEventStore
+from donor_scoring import ACTION_VALUES, CTA_VALUES, DECAY_RATE, decay_factors, score_donors
+
+DAYS_PER_WEEK = 7
+
+
+def day_ordinal(when: Union[date, datetime]) -> int:
+    return when.toordinal()
+
+
+def recompute_scores(columns: Dict[str, np.ndarray], as_of_day: int, n_donors: Optional[int] = None) -> np.ndarray:
+    """Full recompute from history with the same weeks-ago rule as calculate_score."""
+    week_offsets = (as_of_day - columns["day"].astype(np.int64)) // DAYS_PER_WEEK
+    return score_donors(columns["donor_id"], week_offsets, columns["action"], columns["cta"], n_donors)
+
+
+class DonorScoreState:
+    """
+    Per-donor decayed scores kept current by rolling forward instead of
+    recomputing from the whole history.
+
+    weeks_ago is floor(days_ago / 7), so events on different weekdays cross
+    week boundaries on different days. Scores are therefore kept as seven
+    partial sums per donor, one per event-day residue mod 7. Within a residue
+    every event ages by the same number of whole weeks, so rolling forward is
+    an exact multiply and matches a full recompute to floating-point error.
+    """
+
+    def __init__(self, as_of_day: int, n_donors: int = 0, store: Optional[DonorEventStore] = None):
+        self.as_of_day = int(as_of_day)
+        self.partials = np.zeros((n_donors, DAYS_PER_WEEK), dtype=np.float64)
+        self.store = store
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.partials.sum(axis=1)
+
+    def _grow(self, n_donors: int) -> None:
+        if n_donors > len(self.partials):
+            grown = np.zeros((n_donors, DAYS_PER_WEEK), dtype=np.float64)
+            grown[: len(self.partials)] = self.partials
+            self.partials = grown
+
+    def roll_forward(self, day: int) -> None:
+        """Decay every donor's score to `day`; cost is O(donors), independent of history."""
+        if day < self.as_of_day:
+            raise ValueError(f"Cannot roll back from day {self.as_of_day} to {day}")
+        residues = np.arange(DAYS_PER_WEEK)
+        elapsed_weeks = (day - residues) // DAYS_PER_WEEK - (self.as_of_day - residues) // DAYS_PER_WEEK
+        self.partials *= DECAY_RATE ** elapsed_weeks
+        self.as_of_day = int(day)
+
+    def add_events(self, donor_ids, days, action_codes, cta_codes) -> None:
+        """Fold new events into the scores as of the current as_of_day."""
+        donor_ids = np.asarray(donor_ids, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        if not len(donor_ids):
+            return
+        self._grow(int(donor_ids.max()) + 1)
+        weights = (
+            ACTION_VALUES[np.asarray(action_codes, dtype=np.intp)]
+            * CTA_VALUES[np.asarray(cta_codes, dtype=np.intp)]
+            * decay_factors((self.as_of_day - days) // DAYS_PER_WEEK)
+        )
+        cells = donor_ids * DAYS_PER_WEEK + days % DAYS_PER_WEEK
+        self.partials += np.bincount(cells, weights=weights, minlength=self.partials.size).reshape(self.partials.shape)
+
+    def ingest(self, donor_ids, days, action_codes, cta_codes) -> None:
+        """Append new events to the event store (if any) and fold them into the scores."""
+        if self.store is not None:
+            self.store.append(donor_ids, days, action_codes, cta_codes)
+        self.add_events(donor_ids, days, action_codes, cta_codes)
+
+    def full_recompute(self) -> np.ndarray:
+        """Rebuild scores from the event store, e.g. to audit the rolled-forward state."""
+        return recompute_scores(self.store.columns(), self.as_of_day, len(self.partials))
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, partials=self.partials, as_of_day=self.as_of_day)
+
+    @classmethod
+    def load(cls, path: str, store: Optional[DonorEventStore] = None) -> "DonorScoreState":
+        with np.load(path) as data:
+            state = cls(int(data["as_of_day"]), store=store)
+            state.partials = data["partials"]
+        return state
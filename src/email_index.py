@@ -0,0 +1,275 @@
+import hashlib
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from openai import OpenAI
+
+from json_stream import iter_emails
+from tag_analytics import load_scores
+
+load_dotenv()
+
+SRC_DIR = os.path.dirname(__file__)
+EMAILS_JSON = os.path.join(SRC_DIR, "all_emails_full.json")
+TAGGED_CSV = os.path.join(SRC_DIR, "tagged_emails2.csv")
+EMBEDDING_CACHE = os.path.join(SRC_DIR, "..", ".cache", "email_embeddings")
+
+EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_BATCH = 256
+MAX_EMBED_CHARS = 8000
+# Cache keys are hex sha256 digests, stored fixed-width
+KEY_BYTES = 64
+
+# issue_selector labels -> tagging categories used to pick on-issue examples
+ISSUE_TO_CATEGORY = {
+    "climate": "Climate Change",
+    "healthcare": "Healthcare Access",
+    "education": "Public Education",
+    "jobs": "Jobs & Wages",
+    "gun safety": "Gun Safety",
+    "immigration": "Immigration",
+    "foreign policy": "National Security",
+    "public safety": "Criminal Justice Reform",
+}
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingCache:
+    """
+    Unit-normalized embeddings keyed by a hash of (model, text), stored
+    append-only in a directory: keys.bin holds fixed-width keys and
+    vectors.bin a little-endian uint32 dimension followed by float32 rows.
+    embed() only calls the API for texts it has not seen before and appends
+    just those, one API batch at a time.
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE, api_client: Optional[OpenAI] = None):
+        self.path = path
+        self._client = api_client
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        keys_path, vectors_path = self._files()
+        if os.path.exists(keys_path) and os.path.exists(vectors_path) and os.path.getsize(vectors_path) >= 4:
+            keys = np.fromfile(keys_path, dtype=f"S{KEY_BYTES}", count=os.path.getsize(keys_path) // KEY_BYTES)
+            with open(vectors_path, "rb") as f:
+                dim = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+                rows = (os.path.getsize(vectors_path) - 4) // (4 * dim)
+                # A crash mid-append can leave the files with different lengths; only full rows count
+                n = min(len(keys), rows)
+                self._vectors = np.fromfile(f, dtype="<f4", count=n * dim).reshape(n, dim)
+            self._rows = {k.decode("ascii"): i for i, k in enumerate(keys[:n])}
+
+    def _files(self) -> Tuple[str, str]:
+        return os.path.join(self.path, "keys.bin"), os.path.join(self.path, "vectors.bin")
+
+    @property
+    def client(self) -> OpenAI:
+        if self._client is None:
+            self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
+
+    def embed(self, texts: Sequence[str], persist: bool = True) -> np.ndarray:
+        """
+        One row per text. With persist=False new vectors are returned but not
+        stored, for one-off queries such as the article being drafted.
+        """
+        texts = [t[:MAX_EMBED_CHARS] for t in texts]
+        keys = [_text_key(t) for t in texts]
+        by_key = dict(zip(keys, texts))
+        missing = list(dict.fromkeys(k for k in keys if k not in self._rows))
+        fresh: Dict[str, np.ndarray] = {}
+        for i in range(0, len(missing), EMBEDDING_BATCH):
+            batch = missing[i : i + EMBEDDING_BATCH]
+            resp = self.client.embeddings.create(model=EMBEDDING_MODEL, input=[by_key[k] for k in batch])
+            vectors = _normalize_rows(np.asarray(
+                [item.embedding for item in sorted(resp.data, key=lambda d: d.index)], dtype=np.float32
+            ))
+            if persist:
+                self._append(batch, vectors)
+            else:
+                fresh.update(zip(batch, vectors))
+        if not fresh:
+            return self._vectors[[self._rows[k] for k in keys]]
+        return np.stack([fresh[k] if k in fresh else self._vectors[self._rows[k]] for k in keys])
+
+    def _append(self, keys: List[str], vectors: np.ndarray) -> None:
+        n = len(self._rows)
+        self._vectors = vectors if n == 0 else np.vstack([self._vectors, vectors])
+        self._rows.update({k: n + i for i, k in enumerate(keys)})
+
+        os.makedirs(self.path, exist_ok=True)
+        keys_path, vectors_path = self._files()
+        dim = vectors.shape[1]
+        # Vectors first, then keys: rows without a key are ignored on load.
+        # Truncating first drops any partial tail from an interrupted append.
+        with open(vectors_path, "r+b" if n and os.path.exists(vectors_path) else "wb") as f:
+            if n == 0:
+                np.array([dim], dtype="<u4").tofile(f)
+            f.truncate(4 + n * dim * 4)
+            f.seek(0, os.SEEK_END)
+            vectors.astype("<f4", copy=False).tofile(f)
+        with open(keys_path, "r+b" if n and os.path.exists(keys_path) else "wb") as f:
+            f.truncate(n * KEY_BYTES)
+            f.seek(0, os.SEEK_END)
+            np.array(keys, dtype=f"S{KEY_BYTES}").tofile(f)
+
+
+class EmailIndex:
+    """
+    Nearest-neighbour index over past campaign emails.
+
+    Search is an exact batched cosine top-K over a flat matrix. For large
+    archives build_ivf() adds an inverted-file partition (spherical k-means),
+    after which queries only scan the n_probe closest lists.
+    """
+
+    def __init__(self, emails: List[Dict[str, Any]], vectors: np.ndarray):
+        self.emails = emails
+        self.vectors = vectors.astype(np.float32, copy=False)
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        n = len(self.vectors)
+        n_lists = min(n, n_lists or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(n, n_lists, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(self.vectors @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = self.vectors[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize_rows(centroids)
+        assign = np.argmax(self.vectors @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.lists = [np.flatnonzero(assign == c) for c in range(n_lists)]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 3,
+        candidates: Optional[np.ndarray] = None,
+        n_probe: int = 4,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k (email index, cosine similarity) for each query vector.
+        `candidates` restricts the search to a subset of email indices.
+        """
+        queries = _normalize_rows(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        allowed = None if candidates is None else np.asarray(candidates, dtype=np.int64)
+
+        if self.centroids is None:
+            # Flat index: one matrix product scores every query against every email
+            ids = np.arange(len(self.vectors)) if allowed is None else allowed
+            return [_top_k(row, ids, k) for row in queries @ self.vectors[ids].T]
+
+        results = []
+        for q in queries:
+            probe = np.argsort(-(self.centroids @ q))[:n_probe]
+            ids = np.concatenate([self.lists[c] for c in probe])
+            if allowed is not None:
+                ids = np.intersect1d(ids, allowed)
+            results.append(_top_k(self.vectors[ids] @ q, ids, k))
+        return results
+
+
+def _top_k(sims: np.ndarray, ids: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    top = np.argpartition(-sims, k - 1)[:k] if len(sims) > k else np.arange(len(sims))
+    top = top[np.argsort(-sims[top])]
+    return [(int(ids[i]), float(sims[i])) for i in top]
+
+
+def load_tagged_emails(emails_path: str = EMAILS_JSON, tagged_csv: str = TAGGED_CSV) -> List[Dict[str, Any]]:
+    """Past emails with their tagger scores (joined on subject) under "scores"."""
+    scores_by_subject: Dict[str, Dict[str, int]] = {}
+    if os.path.exists(tagged_csv):
+        subjects, categories, matrix = load_scores(tagged_csv)
+        for subject, row in zip(subjects, matrix):
+            scores_by_subject[subject] = dict(zip(categories, map(int, row)))
+    return [
+        {**email, "scores": scores_by_subject.get(email["subject"], {})}
+        for email in iter_emails(emails_path)
+    ]
+
+
+def _email_text(email: Dict[str, Any]) -> str:
+    return f"{email.get('subject', '')}\n\n{email.get('body', '')}"
+
+
+def build_index(emails: Optional[List[Dict[str, Any]]] = None, cache: Optional[EmbeddingCache] = None) -> EmailIndex:
+    emails = emails if emails is not None else load_tagged_emails()
+    cache = cache or EmbeddingCache()
+    return EmailIndex(emails, cache.embed([_email_text(e) for e in emails]))
+
+
+def few_shot_examples(
+    article: Dict[str, Any],
+    index: EmailIndex,
+    cache: Optional[EmbeddingCache] = None,
+    k: int = 3,
+    min_score: int = 4,
+) -> List[str]:
+    """
+    The k past emails most similar to an article, preferring ones the tagger
+    scored >= min_score on the article's issue. Returns "Subject\\n\\nBody" texts.
+    """
+    cache = cache or EmbeddingCache()
+    # Articles are one-off queries, so they are not added to the email store
+    query = cache.embed([f"{article.get('title', '')}\n\n{article.get('description', '')}"], persist=False)
+
+    category = ISSUE_TO_CATEGORY.get(article.get("issue") or "")
+    candidates = None
+    if category:
+        on_issue = [i for i, e in enumerate(index.emails) if e.get("scores", {}).get(category, 0) >= min_score]
+        if len(on_issue) >= k:
+            candidates = np.array(on_issue)
+
+    hits = index.search(query, k=k, candidates=candidates)[0]
+    return [_email_text(index.emails[i]) for i, _ in hits]
+
+
+def example_provider(k: int = 3, min_score: int = 4) -> Optional[Callable[[Dict[str, Any]], List[str]]]:
+    """
+    Build the index once (embeddings come from the on-disk cache) and return
+    article -> few-shot examples for the drafting paths, or None when k is 0
+    or the index cannot be built. A failed lookup prints a warning and yields
+    no examples rather than failing the draft.
+    """
+    if k <= 0:
+        return None
+    try:
+        cache = EmbeddingCache()
+        index = build_index(cache=cache)
+    except Exception as e:
+        print(f"⚠️ Past-email index unavailable ({e}); drafting without few-shot examples.")
+        return None
+    print(f"📚 Drafting with the {k} most similar of {len(index.emails)} past campaign emails")
+
+    def examples_for(article: Dict[str, Any]) -> List[str]:
+        try:
+            return few_shot_examples(article, index, cache, k=k, min_score=min_score)
+        except Exception as e:
+            print(f"⚠️ Could not retrieve past emails for '{(article.get('title') or '')[:60]}': {e}")
+            return []
+
+    return examples_for
+
+
+if __name__ == "__main__":
+    index = build_index()
+    print(f"✅ Indexed {len(index.emails)} emails ({index.vectors.shape[1]}-dim {EMBEDDING_MODEL})")
+    sample = {"title": "Republicans push new voter ID law", "description": "", "issue": None}
+    for text in few_shot_examples(sample, index):
+        print("—", text.splitlines()[0])
+    print(f"💾 Embeddings cached at {os.path.abspath(EMBEDDING_CACHE)}")
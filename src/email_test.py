@@ -1,6 +1,8 @@
 
 from datetime import datetime, timedelta
 
+from donor_scoring import action_scores, cta_weights, decay, interest_bucket
+
 # Dummy donor email interaction history
 donor_history = [
     {"date": datetime.now() - timedelta(weeks=1), "action": "clicked", "cta": "petition"},
@@ -10,27 +12,6 @@ donor_history = [
     {"date": datetime.now() - timedelta(weeks=8), "action": "ignored", "cta": "petition"},
 ]
 
-# Action scores
-action_scores = {
-    "clicked": 1,
-    "clicked_multiple": 2,  # example, not used here
-    "donated": 5,
-    "ignored": -1,
-    "opened_no_click": 0,
-}
-
-# CTA weights
-cta_weights = {
-    "informational": 1.0,
-    "petition": 1.5,
-    "volunteer": 2.0,
-    "donation": 2.5
-}
-
-# Exponential decay factor
-def decay(weeks):
-    return (0.9) ** weeks
-
 # Calculate score
 def calculate_score(donor_history):
     total_score = 0
@@ -45,12 +26,4 @@ def calculate_score(donor_history):
 
 score = calculate_score(donor_history)
 print(f"Donor interest score: {score:.2f}")
-
-if score > 5:
-    print("Super Interested")
-elif score > 2:
-    print("Interested")
-elif score < 0:
-    print("Disinterested")
-else:
-    print("Neutral")
+print(interest_bucket(score))
@@ -1,5 +1,7 @@
 import yaml
 
+from keyword_matcher import KeywordMatcher
+
 # Keywords that define each issue area
 ISSUE_KEYWORDS = {
     "policies": [
@@ -30,11 +32,11 @@ ISSUE_KEYWORDS = {
         # Existing issue keywords
         "climate", "wildfire", "hurricane", "carbon", "flood", "heat", "healthcare",
         "medicaid", "hospital", "insurance", "abortion", "school", "college", "student",
-        "education", "tuition", "debt", "unemployment", "job", "labor", "wage",
-        "hiring", "employment", "gun", "shooting", "violence", "firearm", "border",
+        "education", "tuition", "debt", "unemployment", "job", "jobs", "labor", "wage",
+        "hiring", "employment", "gun", "guns", "shooting", "violence", "firearm", "border",
         "immigration", "migrant", "asylum", "inflation", "cost of living", "price",
         "gas", "ai", "artificial intelligence", "tech", "social media", "privacy",
-        "ukraine", "israel", "china", "nato", "war", "conflict", "crime", "police",
+        "ukraine", "israel", "china", "nato", "war", "wars", "conflict", "crime", "police",
         "safety", "law enforcement",
 
         # Global/diplomatic
@@ -58,26 +60,77 @@ CATEGORICAL_ISSUES = {
     "climate": ["climate", "wildfire", "hurricane", "carbon", "flood", "heat"],
     "healthcare": ["healthcare", "medicaid", "hospital", "insurance", "abortion"],
     "education": ["school", "college", "student", "education", "tuition", "debt"],
-    "jobs": ["unemployment", "job", "labor", "wage", "hiring", "employment"],
-    "gun safety": ["gun", "shooting", "violence", "firearm"],
+    "jobs": ["unemployment", "job", "jobs", "labor", "wage", "hiring", "employment"],
+    "gun safety": ["gun", "guns", "shooting", "violence", "firearm"],
     "immigration": ["border", "immigration", "migrant", "asylum"],
     "inflation": ["inflation", "cost of living", "price", "gas"],
     "technology": ["ai", "artificial intelligence", "tech", "social media", "privacy"],
-    "foreign policy": ["ukraine", "israel", "china", "nato", "war", "conflict"],
+    "foreign policy": ["ukraine", "israel", "china", "nato", "war", "wars", "conflict"],
     "public safety": ["crime", "police", "safety", "law enforcement"]
 }
 
 SHARED_KEYWORDS_REQUIRED = 1
+# With a local classifier pre-filter, an article must be predicted at least this
+# score on some campaign category to go on to LLM drafting
+PREFILTER_MIN_SCORE = 3
+
+# Only ordinary words of at least this length also match their plural; shorter
+# words and acronyms would collide with unrelated words ("doe" / "does", "war" / "wares"),
+# so the plurals that matter for them ("jobs", "guns", "wars") are listed explicitly
+MIN_PLURAL_KEYWORD_LENGTH = 4
+# Acronyms and proper nouns never take a plural ("trumps" is a verb, not Trump)
+SINGULAR_KEYWORDS = {
+    "irs", "fbi", "cia", "nsa", "epa", "cdc", "dhs", "doj", "doe", "fda",
+    "ai", "un", "nato", "g7", "g20", "maga", "medicaid", "medicare",
+    "america", "united states", "ukraine", "israel", "china",
+    "trump", "donald trump", "mar-a-lago", "white house", "supreme court",
+}
 
-def get_issue_label(article):
+def _pluralizable(keyword):
+    last_word = keyword.split()[-1]
+    return (
+        len(last_word) >= MIN_PLURAL_KEYWORD_LENGTH
+        and keyword not in SINGULAR_KEYWORDS
+        and not last_word.endswith("s")
+    )
+
+# Every keyword group, compiled once so each article is scanned in a single pass.
+# Keywords only match whole words ("ai" no longer matches inside "said").
+ISSUE_GROUP_PREFIX = "issue:"
+KEYWORD_GROUPS = {
+    "policies": ISSUE_KEYWORDS["policies"],
+    "Trump": ISSUE_KEYWORDS["Trump"],
+    "context": REQUIRED_CONTEXT,
+    **{ISSUE_GROUP_PREFIX + issue: keywords for issue, keywords in CATEGORICAL_ISSUES.items()},
+}
+KEYWORD_MATCHER = KeywordMatcher(
+    KEYWORD_GROUPS,
+    whole_words=True,
+    plural_keywords={kw for kws in KEYWORD_GROUPS.values() for kw in kws if _pluralizable(kw)},
+)
+
+def _article_text(article):
     title = article.get('title') or ''
     desc = article.get('description') or ''
-    text = f"{title} {desc}".lower()
+    return f"{title} {desc}".lower()
+
+def issue_hit_counts(hits):
+    """Per-issue keyword hit counts from KEYWORD_MATCHER.group_counts output."""
+    return {
+        issue: hits[ISSUE_GROUP_PREFIX + issue]
+        for issue in CATEGORICAL_ISSUES
+        if hits[ISSUE_GROUP_PREFIX + issue]
+    }
+
+def _issue_from_hits(hits):
+    # Most keyword hits wins; ties go to the issue listed first
+    counts = issue_hit_counts(hits)
+    if not counts:
+        return None
+    return max(counts, key=counts.get)
 
-    for issue, keywords in CATEGORICAL_ISSUES.items():
-        if any(keyword in text for keyword in keywords):
-            return issue
-    return None
+def get_issue_label(article):
+    return _issue_from_hits(KEYWORD_MATCHER.group_counts(_article_text(article)))
 
 def has_enough_overlap(title, desc):
     if not desc.strip():  # if description is empty, just use title
@@ -87,7 +140,12 @@ def has_enough_overlap(title, desc):
     shared = title_words & desc_words
     return len(shared) >= SHARED_KEYWORDS_REQUIRED
 
-def filter_articles(articles):
+def filter_articles(articles, prefilter=None, min_score=PREFILTER_MIN_SCORE):
+    """
+    Keep national, Trump-related articles, labelled with their main issue.
+    prefilter (a local_classifier.Prefilter) additionally drops articles the
+    local model is confident are off-message, so they never reach the LLM.
+    """
     relevant_articles = []
     seen_content = set()
 
@@ -96,11 +154,11 @@ def filter_articles(articles):
     for article in articles:
         title = article.get('title') or ''
         desc = article.get('description') or ''
-        text = f"{title} {desc}".lower()
+        hits = KEYWORD_MATCHER.group_counts(_article_text(article))
 
-        has_trump = any(keyword in text for keyword in ISSUE_KEYWORDS["Trump"])
-        has_national_context = any(context in text for context in REQUIRED_CONTEXT)
-        has_policy = any(keyword in text for keyword in ISSUE_KEYWORDS["policies"])
+        has_trump = "Trump" in hits
+        has_national_context = "context" in hits
+        has_policy = "policies" in hits
         overlap_ok = has_enough_overlap(title, desc)
 
         print(f"\nAnalyzing article: {title}")
@@ -108,17 +166,20 @@ def filter_articles(articles):
         print(f"Has national context: {has_national_context}")
         print(f"Has policy keywords: {has_policy}")
         print(f"Title/desc keyword overlap sufficient: {overlap_ok}")
+        print(f"Issue keyword hits: {issue_hit_counts(hits)}")
 
         if has_policy and has_trump and overlap_ok:
             content_key = (title.lower(), desc.lower())
-            if content_key not in seen_content:
-                issue = get_issue_label(article)
+            if content_key in seen_content:
+                print("✗ Article rejected (duplicate)")
+            elif prefilter is not None and prefilter.rejects_article(article, min_score):
+                print("✗ Article rejected (local classifier: confidently off-message)")
+            else:
+                issue = _issue_from_hits(hits)
                 article["issue"] = issue if issue else "unknown"
                 relevant_articles.append(article)
                 seen_content.add(content_key)
                 print("✓ Article accepted")
-            else:
-                print("✗ Article rejected (duplicate)")
         else:
             print("✗ Article rejected (not relevant)")
 
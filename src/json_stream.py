@@ -0,0 +1,78 @@
+import json
+from typing import Any, Dict, Iterator, TextIO
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+# Characters that can follow a complete top-level array element
+_ELEMENT_END = frozenset(" \t\r\n,]")
+
+
+def _iter_array(f: TextIO, buf: str, chunk_size: int) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one at a time from a growing buffer."""
+    pos = buf.index("[") + 1
+    eof = False
+    while True:
+        # Skip whitespace and separators, reading more input as needed
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of file inside JSON array")
+        if buf[pos] == "]":
+            return
+
+        try:
+            value, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            end = None
+        # A value may be cut off where the buffer ends: raw_decode accepts "4." of "4.5"
+        # as 4, so a number only counts once a separator (or EOF) follows it
+        truncated = not eof and end is not None and (
+            end == len(buf) or (isinstance(value, (int, float)) and buf[end] not in _ELEMENT_END)
+        )
+        if end is None or truncated:
+            if eof:
+                raise ValueError(f"Malformed JSON array element near offset {pos}")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        yield value
+        pos = end
+
+
+def iter_json_records(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Lazily yield the records of a JSON array file or a JSONL file (one object
+    per line). Memory use is bounded by the largest single record.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        while not buf.strip():
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+
+        if buf.lstrip().startswith("["):
+            yield from _iter_array(f, buf, chunk_size)
+            return
+
+        f.seek(0)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_emails(path: str) -> Iterator[Dict[str, str]]:
+    """Yield {subject, body} records from an email export (JSON array or JSONL)."""
+    for record in iter_json_records(path):
+        yield {"subject": record.get("subject", ""), "body": record.get("body", "")}
@@ -0,0 +1,181 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# (start, end, keyword) of a single occurrence in the scanned text
+Match = Tuple[int, int, str]
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _keyword_regex(keyword: str, whole_words: bool) -> str:
+    if not whole_words:
+        return re.escape(keyword)
+    # Any run of whitespace may separate the words of a phrase
+    return r"\s+".join(re.escape(token) for token in keyword.split())
+
+
+def _text_offset(matched: str, offset: int) -> int:
+    """Offset in `matched` of character `offset` of its whitespace-collapsed form."""
+    pos = 0
+    for word in re.finditer(r"\S+", matched):
+        if offset < pos + len(word.group()):
+            return word.start() + offset - pos
+        pos += len(word.group()) + 1
+    return len(matched)
+
+
+def plural(keyword: str) -> str:
+    """Regular English plural of a keyword's last word ("policy" -> "policies", "tax" -> "taxes")."""
+    if len(keyword) > 1 and keyword.endswith("y") and keyword[-2] not in "aeiou":
+        return keyword[:-1] + "ies"
+    if keyword.endswith(("s", "x", "z", "ch", "sh")):
+        return keyword + "es"
+    return keyword + "s"
+
+
+def _trie_regex(forms: Iterable[str], whole_words: bool) -> str:
+    """
+    One regex matching any of `forms`, factored as a trie ("trump(?:\\s+administration)?")
+    so each position tries at most one branch per character instead of every keyword.
+    Optional tails are greedy, so the longest form at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for form in forms:
+        node = trie
+        for ch in form:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # a form ends here
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = []
+        for ch in sorted(k for k in node if k):
+            piece = r"\s+" if whole_words and ch == " " else re.escape(ch)
+            branches.append(piece + build(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Single-pass matcher for several named keyword groups.
+
+    All keywords are compiled into one trie-factored alternation regex, so
+    the text is scanned once and every keyword occurrence is found, including
+    overlapping ones like "trump" / "trump administration". Each match is the
+    longest keyword at its position; the shorter keywords that are prefixes
+    of it are filled in from a precomputed table, and the few offsets inside
+    it where another keyword could start are re-checked individually.
+
+    With whole_words=True a keyword only matches on word boundaries (so "ai"
+    no longer matches inside "said") and the words of a phrase may be
+    separated by any whitespace. Keywords listed in `plural_keywords` also
+    match their regular plural (see plural()); others match only as written,
+    so short words and acronyms like "doe" never match "does".
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]], whole_words: bool = False,
+                 plural_keywords: Optional[Iterable[str]] = None):
+        self.groups: Dict[str, List[str]] = {name: list(kws) for name, kws in groups.items()}
+        self.whole_words = whole_words
+
+        # keyword -> names of the groups it belongs to
+        self.keyword_groups: Dict[str, Set[str]] = {}
+        for name, keywords in self.groups.items():
+            for kw in keywords:
+                self.keyword_groups.setdefault(kw, set()).add(name)
+
+        # keyword -> the written forms it matches (itself, plus its plural if opted in)
+        plurals = set(plural_keywords or ()) if whole_words else set()
+        self.forms: Dict[str, List[str]] = {
+            kw: [plural(kw), kw] if kw in plurals else [kw] for kw in self.keyword_groups
+        }
+        keywords = sorted(self.forms, key=len, reverse=True)
+        forms = sorted({form for kw_forms in self.forms.values() for form in kw_forms}, key=len, reverse=True)
+        alternation = _trie_regex(forms, whole_words)
+        if whole_words:
+            self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+        else:
+            self._pattern = re.compile(alternation)
+
+        # written form -> the keywords it is a form of, and the other keywords with a form
+        # that is a prefix of it (those still need their own span confirmed)
+        self._owners: Dict[str, List[str]] = {
+            form: [kw for kw in keywords if form in self.forms[kw]] for form in forms
+        }
+        self._prefixes: Dict[str, List[str]] = {
+            form: [
+                kw for kw in keywords
+                if kw not in self._owners[form] and any(form.startswith(f) for f in self.forms[kw])
+            ]
+            for form in forms
+        }
+        # written form -> offsets inside it where another form could start; the scan
+        # resumes after each match, so occurrences starting there are checked separately
+        self._inner_starts: Dict[str, List[int]] = {
+            form: [
+                offset for offset in range(1, len(form))
+                if not (whole_words and _WORD_CHAR.match(form, offset - 1))
+                and any(other.startswith(form[offset:]) or form.startswith(other, offset) for other in forms)
+            ]
+            for form in forms
+        }
+        # keyword -> anchored pattern used to confirm a prefix keyword's own span
+        self._anchored = {
+            kw: re.compile(
+                "(?:" + "|".join(_keyword_regex(f, whole_words) for f in kw_forms) + ")"
+                + (r"(?!\w)" if whole_words else "")
+            )
+            for kw, kw_forms in self.forms.items()
+        }
+
+    def _canonical(self, matched: str) -> str:
+        return " ".join(matched.split()) if self.whole_words else matched
+
+    def _add_matches(self, matches: List[Match], text: str, start: int, end: int, form: str) -> None:
+        for kw in self._owners[form]:
+            matches.append((start, end, kw))
+        for kw in self._prefixes[form]:
+            span = self._anchored[kw].match(text, start)
+            if span:
+                matches.append((start, span.end(), kw))
+
+    def find_matches(self, text: str) -> List[Match]:
+        """Return (start, end, keyword) for every keyword occurrence, ordered by start."""
+        matches: List[Match] = []
+        for m in self._pattern.finditer(text):
+            start, end = m.span()
+            matched = m.group()
+            form = self._canonical(matched)
+            self._add_matches(matches, text, start, end, form)
+            for offset in self._inner_starts[form]:
+                if matched != form:
+                    # Whitespace inside the match differs from the written form
+                    offset = _text_offset(matched, offset)
+                inner = self._pattern.match(text, start + offset)
+                if inner:
+                    self._add_matches(matches, text, inner.start(), inner.end(), self._canonical(inner.group()))
+        return matches
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """Return every keyword that occurs anywhere in `text`."""
+        return {kw for _, _, kw in self.find_matches(text)}
+
+    def match_groups(self, text: str) -> Dict[str, Set[str]]:
+        """Return {group name: matched keywords} for every group with a hit."""
+        hits: Dict[str, Set[str]] = {}
+        for kw in self.find_keywords(text):
+            for name in self.keyword_groups[kw]:
+                hits.setdefault(name, set()).add(kw)
+        return hits
+
+    def group_counts(self, text: str) -> Counter:
+        """Return {group name: number of keyword occurrences} for every group with a hit."""
+        counts: Counter = Counter()
+        for _, _, kw in self.find_matches(text):
+            for name in self.keyword_groups[kw]:
+                counts[name] += 1
+        return counts
@@ -0,0 +1,187 @@
+"""
+Helpers for showing streamed LLM drafts while they are still being written.
+
+PartialJsonStrings pulls the string fields out of a JSON reply that has only
+partly arrived, scanning each streamed delta once; partial_json_strings() is
+the one-shot form. LiveSections redraws several independently updating
+sections in place on an ANSI terminal.
+"""
+import re
+import shutil
+import sys
+import textwrap
+import time
+from typing import Dict, List, TextIO, Tuple
+
+_FIELD_START = re.compile(r'"([A-Za-z_][A-Za-z0-9_]*)"\s*:\s*"')
+# Title plus at least two lines of body, per live section
+MIN_SECTION_LINES = 3
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _read_partial_string(text: str, start: int) -> Tuple[str, int]:
+    """
+    Decode a JSON string body from `start`, stopping at its closing quote or
+    wherever the text ends. Returns the value and the index where decoding stopped.
+    """
+    out = []
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch == '"':
+            break
+        if ch != "\\":
+            out.append(ch)
+            i += 1
+            continue
+        if i + 1 >= len(text):
+            break  # escape split across deltas
+        code = text[i + 1]
+        if code == "u":
+            digits = text[i + 2:i + 6]
+            if len(digits) < 4:
+                break
+            try:
+                point = int(digits, 16)
+            except ValueError:
+                i += 6
+                continue
+            if 0xD800 <= point < 0xDC00:
+                # A high surrogate is joined with the low one after it (\ud83d\ude00 is one emoji)
+                if len(text) < i + 12:
+                    break
+                if text[i + 6:i + 8] == "\\u":
+                    try:
+                        low = int(text[i + 8:i + 12], 16)
+                    except ValueError:
+                        low = 0
+                    if 0xDC00 <= low < 0xE000:
+                        out.append(chr(0x10000 + ((point - 0xD800) << 10) + (low - 0xDC00)))
+                        i += 12
+                        continue
+            out.append(chr(point))
+            i += 6
+        else:
+            out.append(_ESCAPES.get(code, code))
+            i += 2
+    return "".join(out), i
+
+
+class PartialJsonStrings:
+    """
+    Top-level string fields of a JSON object fed in pieces, in the order they
+    appear. The last field may be cut short; code fences are tolerated. Only
+    the text not yet consumed is kept between feeds, so a streamed reply is
+    scanned once in total rather than once per delta.
+    """
+
+    def __init__(self):
+        self._fields: Dict[str, str] = {}
+        self._tail = ""     # unconsumed text: a possible field start or a split escape
+        self._name = None   # field whose value is being decoded
+        self._value: List[str] = []
+
+    def feed(self, delta: str) -> None:
+        text = self._tail + delta
+        pos = 0
+        while True:
+            if self._name is None:
+                match = _FIELD_START.search(text, pos)
+                if not match:
+                    # An unfinished field start begins at one of the last two quotes
+                    last = text.rfind('"', pos)
+                    start = text.rfind('"', pos, last) if last > pos else -1
+                    self._tail = text[start if start >= 0 else last:] if last >= 0 else ""
+                    return
+                self._name, self._value, pos = match.group(1), [], match.end()
+            value, pos = _read_partial_string(text, pos)
+            self._value.append(value)
+            if pos >= len(text) or text[pos] != '"':
+                self._tail = text[pos:]
+                return
+            self._fields.setdefault(self._name, "".join(self._value))
+            self._name = None
+            pos += 1
+
+    @property
+    def fields(self) -> Dict[str, str]:
+        fields = dict(self._fields)
+        if self._name is not None:
+            fields.setdefault(self._name, "".join(self._value))
+        return fields
+
+
+def partial_json_strings(text: str) -> Dict[str, str]:
+    """Top-level string fields of a possibly incomplete JSON object; see PartialJsonStrings."""
+    parser = PartialJsonStrings()
+    parser.feed(text)
+    return parser.fields
+
+
+class LiveSections:
+    """
+    Several titled text sections redrawn in place as they change. Each section
+    shows only its latest lines so that every section fits on screen together;
+    check fits() first, since a frame taller than the terminal cannot be redrawn.
+    Call finish() to erase the live view once all sections are complete.
+    """
+
+    @staticmethod
+    def fits(count: int) -> bool:
+        """Whether `count` sections of MIN_SECTION_LINES each fit on the terminal at once."""
+        return count * MIN_SECTION_LINES <= shutil.get_terminal_size().lines - 1
+
+    def __init__(self, titles: List[str], stream: TextIO = sys.stdout, min_interval: float = 0.05):
+        self.titles = list(titles)
+        self.bodies = [""] * len(titles)
+        self.done = [False] * len(titles)
+        self.stream = stream
+        self.min_interval = min_interval
+        self._drawn = 0
+        self._last_draw = float("-inf")
+
+    def due(self) -> bool:
+        """Whether an update now would redraw; lets callers skip building bodies that would not be shown."""
+        return time.monotonic() - self._last_draw >= self.min_interval
+
+    def update(self, index: int, body: str, done: bool = False) -> None:
+        self.bodies[index] = body
+        self.done[index] = done
+        if done or self.due():
+            self.render()
+
+    def _lines(self) -> List[str]:
+        width, height = shutil.get_terminal_size()
+        width = max(width - 1, 20)
+        per_section = max(MIN_SECTION_LINES, (height - 1) // max(len(self.titles), 1))
+        lines = []
+        for title, body, done in zip(self.titles, self.bodies, self.done):
+            status = "✅" if done else "⏳"
+            lines.append(f"{status} {title}"[:width])
+            wrapped = [
+                piece
+                for line in body.strip("\n").split("\n")
+                for piece in (textwrap.wrap(line, width) or [""])
+            ]
+            lines.extend(wrapped[-(per_section - 1):])
+        # If the terminal shrank mid-stream, drop the top of the frame: moving the
+        # cursor back past the first screen line would leave stale lines behind
+        return lines[max(len(lines) - max(height - 1, 1), 0):]
+
+    def _clear(self) -> None:
+        if self._drawn:
+            # Back to the first line of the previous frame, then erase to the end of the screen
+            self.stream.write(f"\x1b[{self._drawn}F\x1b[J")
+        self._drawn = 0
+
+    def render(self) -> None:
+        lines = self._lines()
+        self._clear()
+        self.stream.write("".join(line + "\n" for line in lines))
+        self.stream.flush()
+        self._drawn = len(lines)
+        self._last_draw = time.monotonic()
+
+    def finish(self) -> None:
+        self._clear()
+        self.stream.flush()
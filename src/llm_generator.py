@@ -1,13 +1,48 @@
 import os
 import json
-from openai import OpenAI
+import asyncio
+import weakref
+from openai import OpenAI, AsyncOpenAI, ContentFilterFinishReasonError, LengthFinishReasonError
 from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
+
+from llm_cache import cache_disabled, cache_key, get_cache
+from structured_output import ParseStats, supports_structured_outputs
 
 # Load environment variables
 load_dotenv()
 
 # Create OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# AsyncOpenAI keeps its connections on the event loop that opened them, so each
+# loop gets its own client (see _async_client and run_async)
+_async_clients = weakref.WeakKeyDictionary()
+
+# Structured outputs need a gpt-4o-class model; older models fall back to parsing the text reply
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+LLM_TEMPERATURE = 0.85
+# Bump whenever the prompt template below changes so cached replies are not reused
+PROMPT_VERSION = 1
+# Same, for the localized fan-out prompt (build_localized_prompt)
+LOCALIZED_PROMPT_VERSION = 1
+
+DEFAULT_LOCATION = "Washington, DC"
+# Localized drafts requested at once by generate_localized_outputs
+LOCALIZE_CONCURRENCY = 8
+
+# How often drafts came back unusable, across every call in this process
+parse_stats = ParseStats()
+
+
+class DonorEmailDraft(BaseModel):
+    issue: str
+    local_stat: str
+    email: str
+
+
+class IssueAnalysis(BaseModel):
+    issue: str
+
 
 def clean_json_response(raw):
     """
@@ -23,10 +58,33 @@ def clean_json_response(raw):
 
     return "\n".join(cleaned)
 
-def generate_llm_output(article, location="Washington, DC"):
+def _article_full_text(article):
     title = article.get("title", "")
+    return article.get("full_text") or f"{title}\n\n{article.get('description', '')}"
+
+def _response_cache_key(article, location, examples=None):
+    parts = [LLM_MODEL, LLM_TEMPERATURE, PROMPT_VERSION, _article_full_text(article), location]
+    if examples:
+        parts.append(list(examples))
+    return cache_key(*parts)
+
+def _examples_section(examples):
+    if not examples:
+        return ""
+    shots = "\n\n---\n\n".join(examples)
+    return f"""
+Here are past emails from this campaign on similar issues. Match their voice and structure, but do not copy them:
+
+{shots}
+"""
+
+def build_prompt(article, location=DEFAULT_LOCATION, examples=None):
+    """
+    examples: optional past campaign emails (e.g. from email_index.few_shot_examples)
+    included as few-shot style references.
+    """
     source = article.get("source_id", "")
-    full_text = article.get("full_text") or f"{title}\n\n{article.get('description', '')}"
+    full_text = _article_full_text(article)
 
     prompt = f"""
 You are an expert political strategist helping a Democratic campaign.
@@ -54,9 +112,73 @@ Meanwhile, my opponent voted against funding climate resilience for local commun
 I’m working to reverse that by fighting for [Policy X, Y, Z].
 Will you chip in $[X] to help us take this fight to Congress?
 P.S. If you haven’t read the article, it’s worth your time: [link]
+{_examples_section(examples)}
+Use this JSON format in your response (no markdown or code blocks):
+
+{{
+  "issue": "name of issue",
+  "local_stat": "locally relevant stat or impact sentence",
+  "email": "donor email message"
+}}
+
+ARTICLE FROM {source}:
+{full_text}
+"""
+
+    return prompt
+
+ISSUE_CATEGORIES = (
+    "climate, healthcare, education, jobs, gun safety, immigration, inflation, technology, foreign policy, public safety"
+)
+
+def build_issue_prompt(article):
+    return f"""
+Identify the main national issue in this news article. Use broad categories like:
+{ISSUE_CATEGORIES}.
 
 Use this JSON format in your response (no markdown or code blocks):
 
+{{"issue": "name of issue"}}
+
+ARTICLE FROM {article.get("source_id", "")}:
+{_article_full_text(article)}
+"""
+
+def build_localized_prompt(article, issue, location, examples=None):
+    """
+    Like build_prompt, but the issue is already identified and the location
+    comes last, so every location's prompt shares the same long prefix
+    (instructions + article) and providers can serve it from their prompt cache.
+    """
+    source = article.get("source_id", "")
+    full_text = _article_full_text(article)
+
+    prompt = f"""
+You are an expert political strategist helping a Democratic campaign.
+
+Your job is to turn a national news article into persuasive fundraising emails for donors in a specific place. The emails must feel **locally relevant**, emotionally compelling, and must highlight contrasts with Republican inaction — especially Trump and the GOP.
+
+The article and its main national issue are given below, followed by the LOCATION to write for. Please complete these steps:
+
+1. Generate a single **locally relevant stat or impact sentence** about the issue in the LOCATION. Make it sound specific and real, as if it came from a report, government source, or journalistic investigation. Be creative, but grounded.
+Turn this stat into a powerful, emotionally resonant message.
+• Humanize it so it’s felt, not just understood.
+• Apply the storytelling principles of Chip & Dan Heath’s Made to Stick (concrete anchors, vivid analogies), the surprising-reality framing of Hans Rosling’s Factfulness, and the visual, audience-first clarity of Cole Knaflic’s Storytelling with Data.
+• Use analogies, real-world equivalents, and a brief narrative vignette that puts a face on the number.
+• Make it sound like a standout line from a great political speech or nonprofit campaign.
+• Audience: Describe the group — e.g., swing voters, working parents, major donors, policy-makers, etc...
+
+2. Write a fundraising email encouraging support for Democrats. The tone should be urgent, emotional, and local. Make it sound real and tailored to residents of the LOCATION. End with a call to donate. Follow this template, replace the rainfall issue with the issue in the article:
+Rainfall has increased by 10 inches in your state over the last year.
+That’s why I wasn’t surprised to read about the flooding disaster in your state this week:
+”[Quote from local article]”
+Meanwhile, my opponent voted against funding climate resilience for local communities.
+I’m working to reverse that by fighting for [Policy X, Y, Z].
+Will you chip in $[X] to help us take this fight to Congress?
+P.S. If you haven’t read the article, it’s worth your time: [link]
+{_examples_section(examples)}
+Use this JSON format in your response (no markdown or code blocks), repeating the issue as given:
+
 {{
   "issue": "name of issue",
   "local_stat": "locally relevant stat or impact sentence",
@@ -65,27 +187,249 @@ Use this JSON format in your response (no markdown or code blocks):
 
 ARTICLE FROM {source}:
 {full_text}
+
+ISSUE: {issue}
+
+LOCATION: {location}
 """
 
+    return prompt
+
+def parse_llm_response(raw):
+    """
+    Parse the model's JSON reply into a DonorEmailDraft dict, or return an {"error", "raw"} dict.
+    """
+    cleaned = clean_json_response(raw)
+
+    try:
+        return DonorEmailDraft.model_validate(json.loads(cleaned)).model_dump()
+    except json.JSONDecodeError:
+        return {"error": "Could not parse response as JSON.", "raw": raw}
+    except ValidationError as e:
+        return {"error": f"Response is missing draft fields: {e.error_count()} errors", "raw": raw}
+
+def _request_kwargs(prompt):
+    return {
+        "model": LLM_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": LLM_TEMPERATURE,
+    }
+
+def _draft_from_parsed_message(message):
+    """Turn a structured-output message into the draft dict (or an error dict for refusals)."""
+    if message.parsed is not None:
+        parse_stats.record(True)
+        return message.parsed.model_dump()
+    parse_stats.record(False, refusal=bool(message.refusal))
+    return {"error": message.refusal or "Model returned no structured output.", "raw": message.content}
+
+def _draft_from_text(raw):
+    parsed = parse_llm_response(raw.strip())
+    parse_stats.record("error" not in parsed)
+    return parsed
+
+def _unparsable(e):
+    # Truncated or filtered structured replies never validate; they count as parse failures
+    parse_stats.record(False)
+    return {"error": f"Structured output incomplete: {e.__class__.__name__}"}
+
+def generate_llm_output(article, location=DEFAULT_LOCATION, use_cache=True, examples=None):
+    """
+    Draft the issue/local_stat/email JSON for an article.
+    Successful replies are cached on disk; pass use_cache=False (or set
+    LLM_CACHE_DISABLED=1) to always call the API. `examples` are optional
+    few-shot past emails (see email_index.few_shot_examples).
+    """
+    use_cache = use_cache and not cache_disabled()
+    key = _response_cache_key(article, location, examples)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            return cached
+
+    prompt = build_prompt(article, location, examples)
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.85
-        )
+        if supports_structured_outputs(LLM_MODEL):
+            # The reply is constrained to the DonorEmailDraft schema, so it always parses
+            response = client.beta.chat.completions.parse(
+                response_format=DonorEmailDraft, **_request_kwargs(prompt)
+            )
+            parsed = _draft_from_parsed_message(response.choices[0].message)
+        else:
+            response = client.chat.completions.create(**_request_kwargs(prompt))
+            parsed = _draft_from_text(response.choices[0].message.content)
+        if use_cache and "error" not in parsed:
+            get_cache().set(key, parsed)
+        return parsed
+
+    except (LengthFinishReasonError, ContentFilterFinishReasonError) as e:
+        return _unparsable(e)
+    except Exception as e:
+        return {"error": str(e)}
+
+async def generate_llm_output_async(article, location=DEFAULT_LOCATION, use_cache=True, examples=None):
+    """
+    Same as generate_llm_output, but awaitable so several articles can be drafted at once.
+    """
+    use_cache = use_cache and not cache_disabled()
+    key = _response_cache_key(article, location, examples)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            return cached
+
+    return await _draft_async(build_prompt(article, location, examples), key if use_cache else None)
 
-        raw = response.choices[0].message.content.strip()
-        cleaned = clean_json_response(raw)
+def _async_client():
+    """The AsyncOpenAI client for the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    api = _async_clients.get(loop)
+    if api is None:
+        api = _async_clients[loop] = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return api
 
+def run_async(coro):
+    """
+    asyncio.run(coro), closing the loop's AsyncOpenAI client before the loop
+    shuts down. Use this instead of asyncio.run for anything that drafts.
+    """
+    async def main():
         try:
-            parsed = json.loads(cleaned)
-            return parsed
-        except json.JSONDecodeError:
-            return {"error": "Could not parse response as JSON.", "raw": raw}
+            return await coro
+        finally:
+            api = _async_clients.pop(asyncio.get_running_loop(), None)
+            if api is not None:
+                await api.close()
+
+    return asyncio.run(main())
+
+async def _draft_async(prompt, key=None):
+    """Request one draft; a successful reply is cached under `key` when one is given."""
+    try:
+        if supports_structured_outputs(LLM_MODEL):
+            response = await _async_client().beta.chat.completions.parse(
+                response_format=DonorEmailDraft, **_request_kwargs(prompt)
+            )
+            parsed = _draft_from_parsed_message(response.choices[0].message)
+        else:
+            response = await _async_client().chat.completions.create(**_request_kwargs(prompt))
+            parsed = _draft_from_text(response.choices[0].message.content)
+        if key and "error" not in parsed:
+            get_cache().set(key, parsed)
+        return parsed
 
+    except (LengthFinishReasonError, ContentFilterFinishReasonError) as e:
+        return _unparsable(e)
     except Exception as e:
         return {"error": str(e)}
 
+async def stream_llm_output_async(article, location=DEFAULT_LOCATION, use_cache=True, examples=None):
+    """
+    Streaming generate_llm_output: yields the reply's text deltas (str) as they
+    arrive, then exactly one final dict, the parsed draft or an error dict.
+    A cached draft is yielded straight away with no deltas.
+    """
+    use_cache = use_cache and not cache_disabled()
+    key = _response_cache_key(article, location, examples)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    kwargs = _request_kwargs(build_prompt(article, location, examples))
+    try:
+        if supports_structured_outputs(LLM_MODEL):
+            async with _async_client().beta.chat.completions.stream(response_format=DonorEmailDraft, **kwargs) as stream:
+                async for event in stream:
+                    if event.type == "content.delta":
+                        yield event.delta
+                completion = await stream.get_final_completion()
+            parsed = _draft_from_parsed_message(completion.choices[0].message)
+        else:
+            chunks = []
+            async for chunk in await _async_client().chat.completions.create(stream=True, **kwargs):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+            parsed = _draft_from_text("".join(chunks))
+    except (LengthFinishReasonError, ContentFilterFinishReasonError) as e:
+        parsed = _unparsable(e)
+    except Exception as e:
+        parsed = {"error": str(e)}
+
+    if use_cache and "error" not in parsed:
+        get_cache().set(key, parsed)
+    yield parsed
+
+async def identify_issue_async(article, use_cache=True):
+    """
+    The article's main issue, identified once so localized drafts can share it.
+    Returns None if the model's reply is unusable.
+    """
+    use_cache = use_cache and not cache_disabled()
+    key = cache_key(LLM_MODEL, "issue", LOCALIZED_PROMPT_VERSION, _article_full_text(article))
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            return cached
+
+    kwargs = {**_request_kwargs(build_issue_prompt(article)), "temperature": 0}
+    try:
+        if supports_structured_outputs(LLM_MODEL):
+            response = await _async_client().beta.chat.completions.parse(response_format=IssueAnalysis, **kwargs)
+            parsed = response.choices[0].message.parsed
+            issue = parsed.issue if parsed else None
+        else:
+            response = await _async_client().chat.completions.create(**kwargs)
+            issue = json.loads(clean_json_response(response.choices[0].message.content)).get("issue")
+    except Exception as e:
+        print(f"⚠️ Could not identify the article's issue: {e}")
+        return None
+    if issue and use_cache:
+        get_cache().set(key, issue)
+    return issue or None
+
+async def generate_localized_outputs_async(article, locations, issue=None, use_cache=True, examples=None,
+                                           max_concurrency=LOCALIZE_CONCURRENCY):
+    """
+    Draft one article for many locations at once, at most `max_concurrency`
+    requests in flight. The issue is identified once (or taken from `issue`,
+    e.g. a draft made during selection) and shared by every location's prompt.
+    Returns {location: draft or error dict} in the order the locations were given.
+    """
+    locations = list(dict.fromkeys(locations))
+    use_cache = use_cache and not cache_disabled()
+    issue = issue or await identify_issue_async(article, use_cache) or article.get("issue") or "unknown"
+    full_text = _article_full_text(article)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def localize(location):
+        parts = [LLM_MODEL, LLM_TEMPERATURE, LOCALIZED_PROMPT_VERSION, full_text, issue, location]
+        if examples:
+            parts.append(list(examples))
+        key = cache_key(*parts)
+        if use_cache:
+            cached = get_cache().get(key)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            return await _draft_async(
+                build_localized_prompt(article, issue, location, examples), key if use_cache else None
+            )
+
+    drafts = await asyncio.gather(*(localize(location) for location in locations))
+    return dict(zip(locations, drafts))
+
+def generate_localized_outputs(article, locations, issue=None, use_cache=True, examples=None,
+                               max_concurrency=LOCALIZE_CONCURRENCY):
+    """Blocking wrapper around generate_localized_outputs_async."""
+    return run_async(generate_localized_outputs_async(
+        article, locations, issue=issue, use_cache=use_cache, examples=examples, max_concurrency=max_concurrency,
+    ))
+
 
 # Describe statistics in more impactful formats/easier to understand for the human mind (instead of 90,000 describe it as 2 stadiums full of people, etc...)
 # Look for a system prompt that can help with this (a prompt to humanize statistics/numbers)
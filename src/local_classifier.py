@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dedup import normalize_text
+from json_stream import iter_emails
+from tag_analytics import load_scores
+
+SRC_DIR = os.path.dirname(__file__)
+EMAILS_JSON = os.path.join(SRC_DIR, "all_emails_full.json")
+TAGGED_CSVS = [os.path.join(SRC_DIR, "tagged_emails2.csv")]
+MODEL_PATH = os.path.join(SRC_DIR, "..", ".cache", "local_classifier.npz")
+
+N_FEATURES = 1 << 15
+N_LEVELS = 6  # scores 0..5
+
+
+# ---------------------------
+# Features
+# ---------------------------
+def featurize(text: str, n_features: int = N_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed unigram + bigram counts, log-scaled and L2-normalized, as (indices, values)."""
+    words = normalize_text(text).split()
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    hashed = np.array([zlib.crc32(g.encode("utf-8")) % n_features for g in grams], dtype=np.int64)
+    indices, counts = np.unique(hashed, return_counts=True)
+    values = np.log1p(counts).astype(np.float32)
+    return indices, values / np.linalg.norm(values)
+
+
+def email_text(email: Dict[str, Any]) -> str:
+    return f"{email.get('subject', '')}\n\n{email.get('body', '')}"
+
+
+def article_text(article: Dict[str, Any]) -> str:
+    """News articles are scored like an email whose subject is the headline."""
+    body = article.get("full_text") or article.get("description") or ""
+    return f"{article.get('title') or ''}\n\n{body}"
+
+
+# ---------------------------
+# Model
+# ---------------------------
+class LocalClassifier:
+    """
+    Per-category multinomial logistic regression over hashed text features,
+    predicting each 0-5 score. Confidence is the lowest top-class probability
+    across categories, so one uncertain category makes the whole item uncertain.
+    """
+
+    def __init__(self, categories: Sequence[str], n_features: int = N_FEATURES):
+        self.categories = list(categories)
+        self.n_features = n_features
+        self.weights = np.zeros((n_features, len(self.categories) * N_LEVELS), dtype=np.float32)
+        self.bias = np.zeros(len(self.categories) * N_LEVELS, dtype=np.float32)
+
+    def _proba(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        logits = (values @ self.weights[indices] + self.bias).reshape(len(self.categories), N_LEVELS)
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(self, texts: Sequence[str], scores: np.ndarray, epochs: int = 15,
+            learning_rate: float = 0.5, l2: float = 1e-5, seed: int = 0) -> "LocalClassifier":
+        """SGD on cross-entropy; scores is an (n_texts, n_categories) array of 0-5 labels."""
+        features = [featurize(t, self.n_features) for t in texts]
+        targets = np.zeros((len(texts), len(self.categories), N_LEVELS), dtype=np.float32)
+        labels = np.clip(np.asarray(scores, dtype=np.int64), 0, N_LEVELS - 1)
+        rows, cols = np.indices(labels.shape)
+        targets[rows, cols, labels] = 1.0
+
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            for i in rng.permutation(len(texts)):
+                indices, values = features[i]
+                grad = (self._proba(indices, values) - targets[i]).ravel()
+                self.weights[indices] -= rate * (np.outer(values, grad) + l2 * self.weights[indices])
+                self.bias -= rate * grad
+        return self
+
+    def predict(self, text: str) -> Tuple[Dict[str, int], float]:
+        proba = self._proba(*featurize(text, self.n_features))
+        levels = proba.argmax(axis=1)
+        confidence = float(proba.max(axis=1).min())
+        return dict(zip(self.categories, map(int, levels))), confidence
+
+    def save(self, path: str = MODEL_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, categories=np.array(self.categories), weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> "LocalClassifier":
+        with np.load(path) as data:
+            model = cls([str(c) for c in data["categories"]], data["weights"].shape[0])
+            model.weights = data["weights"]
+            model.bias = data["bias"]
+        return model
+
+
+class Prefilter:
+    """
+    Routes items to the local model when it is confident, and counts how many
+    were answered locally versus sent on to the LLM.
+    """
+
+    def __init__(self, model: LocalClassifier, min_confidence: float = 0.9):
+        self.model = model
+        self.min_confidence = min_confidence
+        self.local = 0
+        self.remote = 0
+        self._lock = threading.Lock()
+
+    def try_predict(self, text: str) -> Optional[Dict[str, int]]:
+        scores, confidence = self.model.predict(text)
+        with self._lock:
+            if confidence >= self.min_confidence:
+                self.local += 1
+                return scores
+            self.remote += 1
+        return None
+
+    def rejects_article(self, article: Dict[str, Any], min_score: int = 3) -> bool:
+        """
+        True when the model is confident the article scores below min_score on
+        every category, i.e. it is off-message and not worth an LLM draft.
+        Everything else (on-message or uncertain) is left for the LLM.
+        """
+        scores, confidence = self.model.predict(article_text(article))
+        rejected = confidence >= self.min_confidence and max(scores.values(), default=0) < min_score
+        with self._lock:
+            if rejected:
+                self.local += 1
+            else:
+                self.remote += 1
+        return rejected
+
+
+# ---------------------------
+# Training data & evaluation
+# ---------------------------
+def training_data(csv_paths: Sequence[str] = TAGGED_CSVS, emails_json: str = EMAILS_JSON) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    LLM-tagged rows joined back to their email bodies by subject.
+    Returns (categories, texts, scores); rows without a matching email are
+    dropped, and so are rows the pre-filter scored itself, so the model never
+    learns from (or is evaluated on) its own predictions.
+    """
+    bodies = {e["subject"]: email_text(e) for e in iter_emails(emails_json)}
+    categories: List[str] = []
+    texts: List[str] = []
+    blocks = []
+    for path in csv_paths:
+        subjects, file_categories, matrix = load_scores(path, llm_only=True)
+        if categories and file_categories != categories:
+            print(f"⚠️ Skipping {path}: its categories differ from {csv_paths[0]}")
+            continue
+        categories = file_categories
+        keep = [i for i, s in enumerate(subjects) if s in bodies]
+        texts.extend(bodies[subjects[i]] for i in keep)
+        blocks.append(matrix[keep])
+    scores = np.vstack(blocks) if blocks else np.zeros((0, len(categories)), dtype=np.uint8)
+    return categories, texts, scores
+
+
+def agreement_report(model: LocalClassifier, texts: Sequence[str], llm_scores: np.ndarray,
+                     min_confidence: float = 0.9) -> Dict[str, Any]:
+    """Compare local predictions with LLM labels, overall and on the items the prefilter would keep local."""
+    predicted = np.zeros_like(np.asarray(llm_scores, dtype=np.int64))
+    confidence = np.zeros(len(texts))
+    for i, text in enumerate(texts):
+        scores, confidence[i] = model.predict(text)
+        predicted[i] = [scores[c] for c in model.categories]
+
+    llm_scores = np.asarray(llm_scores, dtype=np.int64)
+    exact = predicted == llm_scores
+    confident = confidence >= min_confidence
+    return {
+        "items": len(texts),
+        "exact_agreement": float(exact.mean()) if len(texts) else 0.0,
+        "within_one": float((np.abs(predicted - llm_scores) <= 1).mean()) if len(texts) else 0.0,
+        "item_exact_agreement": float(exact.all(axis=1).mean()) if len(texts) else 0.0,
+        "local_share": float(confident.mean()) if len(texts) else 0.0,
+        "local_exact_agreement": float(exact[confident].mean()) if confident.any() else None,
+        "per_category": dict(zip(model.categories, map(float, exact.mean(axis=0)))) if len(texts) else {},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train or evaluate the local tagging pre-filter.")
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("--csv", nargs="+", default=TAGGED_CSVS, help="LLM-tagged CSVs to learn from")
+    parser.add_argument("--emails", default=EMAILS_JSON, help="email export holding the bodies")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--min-confidence", type=float, default=0.9)
+    parser.add_argument("--holdout", type=float, default=0.2, help="share of rows held out for the report")
+    args = parser.parse_args(argv)
+
+    categories, texts, scores = training_data(args.csv, args.emails)
+    print(f"✅ Loaded {len(texts)} LLM-tagged emails")
+
+    if args.command == "train":
+        LocalClassifier(categories).fit(texts, scores).save(args.model)
+        print(f"✅ Saved model to '{args.model}'")
+        return
+
+    order = np.random.default_rng(0).permutation(len(texts))
+    n_test = max(1, int(len(texts) * args.holdout))
+    test, train = order[:n_test], order[n_test:]
+    model = LocalClassifier(categories).fit([texts[i] for i in train], scores[train])
+    report = agreement_report(model, [texts[i] for i in test], scores[test], args.min_confidence)
+    print(f"📊 Held-out agreement with LLM labels ({report['items']} emails):")
+    print(f"  exact per score:        {report['exact_agreement']:.1%}")
+    print(f"  within one point:       {report['within_one']:.1%}")
+    print(f"  every score exact:      {report['item_exact_agreement']:.1%}")
+    print(f"  kept local at ≥{args.min_confidence}: {report['local_share']:.1%}")
+    if report["local_exact_agreement"] is not None:
+        print(f"  exact on local items:   {report['local_exact_agreement']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
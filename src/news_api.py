@@ -1,60 +1,183 @@
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import httpx
 import yaml
 
+from article_store import get_store
+
+@lru_cache(maxsize=1)
 def load_config():
     with open("config/settings.yaml") as f:
         return yaml.safe_load(f)
 
 _next_page = 1  # guardian uses numeric pages
+_client = None
 
-def fetch_trending_articles():
-    global _next_page
+DEFAULT_SYNC_PAGES = 10
+SYNC_PAGE_SIZE = 50  # the Guardian's maximum page size
+# Stored articles older than this are never offered for selection
+MAX_ARTICLE_AGE_DAYS = 2
+
+def _get_client():
+    """One pooled HTTP session shared by every Guardian request in the process."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            timeout=httpx.Timeout(15.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+    return _client
+
+def _parse_results(results):
+    articles = []
+    for item in results:
+        fields = item.get("fields", {})
+        articles.append({
+            "title": fields.get("headline", item.get("webTitle", "")),
+            "description": fields.get("trailText", ""),
+            "full_text": fields.get("body", ""),
+            "source_id": "guardian",
+            "pubDate": item.get("webPublicationDate", ""),
+            "url": item.get("webUrl", "")
+        })
+    return articles
+
+def _api_settings():
+    config = load_config()
+    # First try to read from env, else fallback to YAML for local testing
+    api_key = os.getenv("GUARDIAN_API_KEY") or config["news_api"].get("key")
+    if not api_key:
+        raise RuntimeError("Guardian API key not found. Set GUARDIAN_API_KEY or add to settings.yaml.")
+    url = config["news_api"].get("base_url", "https://content.guardianapis.com/search")
+    return url, api_key
+
+def _search_params(api_key, page, page_size, **extra):
+    return {
+        "api-key": api_key,
+        "section": "us-news",
+        "page": page,
+        "page-size": page_size,
+        "order-by": "newest",
+        "show-fields": "body,headline,trailText",
+        **extra,
+    }
+
+def _fetch_response(url, params):
+    """The search response body ({"results", "pages", ...}), or {} if the request failed."""
     try:
-        config = load_config()
-        # First try to read from env, else fallback to YAML for local testing
-        api_key = os.getenv("GUARDIAN_API_KEY") or config["news_api"].get("key")
-        if not api_key:
-            raise RuntimeError("Guardian API key not found. Set GUARDIAN_API_KEY or add to settings.yaml.")
-
-        url = config["news_api"].get("base_url", "https://content.guardianapis.com/search")
-        params = {
-            "api-key": api_key,
-            "section": "us-news",
-            "page": _next_page,
-            "page-size": 10,
-            "order-by": "newest",
-            "show-fields": "body,headline,trailText",
-        }
-
-        print(f"\nFetching articles from {url} (page {_next_page})...")
-        response = requests.get(url, params=params)
+        print(f"\nFetching articles from {url} (page {params['page']})...")
+        response = _get_client().get(url, params=params)
         response.raise_for_status()
-        data = response.json()
+        return response.json().get("response", {})
+    except httpx.HTTPError as e:
+        print(f"🛑 Error fetching page {params['page']}: {str(e)}")
+        return {}
+
+def _fetch_page(url, params):
+    return _parse_results(_fetch_response(url, params).get("results", []))
+
+def fetch_article_pages(first_page=1, last_page=4, page_size=10):
+    """
+    Fetch Guardian pages first_page..last_page concurrently over one pooled session.
+    Results are merged in page order; merging stops at the first empty page.
+    Returns {"results": [...], "nextPage": int or None}.
+    """
+    try:
+        url, api_key = _api_settings()
+        pages = list(range(first_page, last_page + 1))
+        params = [_search_params(api_key, page, page_size) for page in pages]
+
+        with ThreadPoolExecutor(max_workers=len(pages)) as pool:
+            page_results = list(pool.map(lambda p: _fetch_page(url, p), params))
+
+        articles = []
+        for page_articles in page_results:
+            if not page_articles:
+                break
+            articles.extend(page_articles)
 
-        results = data.get("response", {}).get("results", [])
-        if not results:
+        if not articles:
             print("⚠️ No articles found")
             return {"results": [], "nextPage": None}
 
-        articles = []
-        for item in results:
-            fields = item.get("fields", {})
-            articles.append({
-                "title": fields.get("headline", item.get("webTitle", "")),
-                "description": fields.get("trailText", ""),
-                "full_text": fields.get("body", ""),
-                "source_id": "guardian",
-                "pubDate": item.get("webPublicationDate", ""),
-                "url": item.get("webUrl", "")
-            })
-
-        _next_page += 1
-        return {"results": articles, "nextPage": _next_page}
-
-    except requests.exceptions.RequestException as e:
-        print(f"🛑 Error fetching articles: {str(e)}")
-        return {"results": [], "nextPage": None}
+        exhausted = any(not page_articles for page_articles in page_results)
+        return {"results": articles, "nextPage": None if exhausted else last_page + 1}
+
     except Exception as e:
         print(f"❌ Unexpected error: {str(e)}")
         return {"results": [], "nextPage": None}
+
+def fetch_trending_articles():
+    """Fetch the next single page; kept for callers that page one at a time."""
+    global _next_page
+    data = fetch_article_pages(_next_page, _next_page)
+    if data["nextPage"] is not None:
+        _next_page = data["nextPage"]
+    return data
+
+def sync_articles(store=None, from_date=None, max_pages=DEFAULT_SYNC_PAGES, page_size=SYNC_PAGE_SIZE):
+    """
+    Fetch articles into the local store. By default only items published on or
+    after the newest stored webPublicationDate are requested (via from-date),
+    so a routine sync is one or two requests. Pass from_date (YYYY-MM-DD) to
+    backfill.
+
+    With a from-date, pages are requested oldest first, so a sync cut off by
+    max_pages stores an unbroken run that the next sync resumes from. Pages
+    are stored in order up to the first one that failed and none after it.
+    Returns the number of articles that were new to the store, or None if
+    any request failed.
+    """
+    store = store or get_store()
+    latest = store.latest_pub_date()
+    # from-date is day-granular; items from that day already stored are matched by URL
+    from_date = from_date or (latest[:10] if latest else None)
+    # An empty store with no from-date just takes the newest max_pages pages
+    extra = {"from-date": from_date, "order-by": "oldest"} if from_date else {}
+    try:
+        url, api_key = _api_settings()
+        first = _fetch_response(url, _search_params(api_key, 1, page_size, **extra))
+        responses = [first]
+
+        pages = first.get("pages") or 1
+        last_page = min(pages, max_pages)
+        if "results" in first and last_page > 1:
+            params = [_search_params(api_key, page, page_size, **extra) for page in range(2, last_page + 1)]
+            with ThreadPoolExecutor(max_workers=min(len(params), 10)) as pool:
+                responses.extend(pool.map(lambda p: _fetch_response(url, p), params))
+    except Exception as e:
+        print(f"❌ Sync failed: {str(e)}")
+        return None
+
+    articles = []
+    failed = False
+    for response in responses:
+        if "results" not in response:
+            failed = True  # _fetch_response already reported the page
+            break
+        articles.extend(_parse_results(response["results"]))
+    new = store.add(articles)
+
+    if failed:
+        print(f"⚠️ Sync stopped at a failed page; kept the {len(articles)} articles before it ({new} new)")
+        return None
+    print(f"🗄️ Synced {len(articles)} articles since {from_date or 'the start'} ({new} new)")
+    if pages > last_page:
+        print(f"⏭️ Stopped after {last_page} of {pages} pages; the next sync continues from {store.latest_pub_date()}")
+    return new
+
+def fetch_stored_articles(limit=40, store=None, max_age_days=MAX_ARTICLE_AGE_DAYS):
+    """
+    Incrementally sync the store, then return its newest `limit` articles
+    published in the last `max_age_days` days, in the same shape as
+    fetch_article_pages. If the sync failed the store may be behind, so the
+    age limit is what keeps old stories from being picked.
+    """
+    store = store or get_store()
+    if sync_articles(store) is None:
+        print(f"⚠️ Using only stored articles from the last {max_age_days} days")
+    since = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"results": store.recent(limit, since=since), "nextPage": None}
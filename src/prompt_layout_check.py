@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import argparse
+import itertools
+import sys
+from typing import List, Optional
+
+from rate_limiter import RateLimiter
+from tagging.benchmark import compare_scores, run_variant
+from tagging.engine import Tagger
+from tagging.prompts import MIN_CACHEABLE_TOKENS, PROMPT_LAYOUTS, static_prefix_tokens
+from tagging.schema import DEFAULT_SCHEMA
+from tagging.sources import SOURCES
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that the prefix prompt layout scores items like the inline layout, and compare prompt-cache hit rates."
+    )
+    parser.add_argument("--source", choices=sorted(SOURCES), default="emails")
+    parser.add_argument("--input", help="items to sample (default depends on --source)")
+    parser.add_argument("--sample", type=int, default=50, help="number of items to tag with each layout")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rpm", type=float, default=60)
+    parser.add_argument("--tpm", type=float, default=90_000)
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="required share of identical scores")
+    args = parser.parse_args(argv)
+
+    source = SOURCES[args.source]
+    prefix_tokens = static_prefix_tokens(DEFAULT_SCHEMA, source.kind)
+    print(f"📏 Static prefix is ~{prefix_tokens} tokens")
+    if prefix_tokens < MIN_CACHEABLE_TOKENS:
+        print(f"❌ Below the {MIN_CACHEABLE_TOKENS}-token minimum for provider prompt caching; "
+              "the prefix layout would never be served from cache")
+        sys.exit(1)
+
+    items = list(itertools.islice(source.load(args.input or source.default_input), args.sample))
+    limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    runs = {}
+    for layout in PROMPT_LAYOUTS:
+        print(f"\n🔄 Tagging {len(items)} {source.name} with the {layout} layout...")
+        tagger = Tagger(source=source, limiter=limiter, layout=layout)
+        runs[layout] = run_variant(tagger, items, "sync", workers=args.workers)
+
+    print("\n🧮 Token usage:")
+    for layout, run in runs.items():
+        usage = run["usage"]
+        print(
+            f"  {layout:<7} {usage['prompt_tokens']:>8} prompt  {usage['cached_tokens']:>8} cached "
+            f"({usage['cache_hit_rate']:.1%})  {usage['completion_tokens']:>6} completion"
+        )
+
+    prefix_usage = runs["prefix"]["usage"]
+    if prefix_usage["requests"] > 1 and not prefix_usage["cached_tokens"]:
+        print("⚠️ No prefix-layout request was served from the prompt cache")
+
+    report = compare_scores(DEFAULT_SCHEMA, items, runs["inline"]["results"], runs["prefix"]["results"])
+    if not report["compared"]:
+        print("❌ No item was tagged by both layouts")
+        sys.exit(1)
+    print(f"\n📊 Score agreement, prefix vs inline ({report['compared']} items, {report['failed']} failed):")
+    print(f"  exact per score:   {report['exact_agreement']:.1%}")
+    print(f"  within one point:  {report['within_one']:.1%}")
+    print(f"  every score exact: {report['item_exact_agreement']:.1%}")
+    print(f"  max difference:    {report['max_abs_diff']}")
+    for label, changes in report["drifted"][:10]:
+        print(f"  ↳ {label[:60]}: " + ", ".join(f"{k} {x}→{y}" for k, (x, y) in changes.items()))
+
+    if report["exact_agreement"] < args.min_agreement:
+        print(f"❌ Scores drifted: {report['exact_agreement']:.1%} < {args.min_agreement:.0%} identical")
+        sys.exit(1)
+    print("✅ No significant score drift between layouts")
+
+
+if __name__ == "__main__":
+    main()
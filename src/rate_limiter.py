@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `rate_per_minute`.
+    acquire() blocks until the requested amount is available.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = float(rate_per_minute)
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_minute / 60.0)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) * 60.0 / self.rate_per_minute
+            time.sleep(wait)
+
+    def set_rate(self, rate_per_minute: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate_per_minute = float(rate_per_minute)
+
+
+class RateLimiter:
+    """
+    Requests/min and tokens/min limits shared by every tagging worker.
+
+    A 429 pauses all workers for the server's retry-after and lowers both
+    rates; each success afterwards recovers a little of the configured rate.
+    """
+
+    BACKOFF_FACTOR = 0.7
+    RECOVERY_FACTOR = 1.05
+    MIN_FRACTION = 0.1
+
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: float = 90_000):
+        self.max_rpm = float(requests_per_minute)
+        self.max_tpm = float(tokens_per_minute)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+
+    def acquire(self, tokens: float) -> None:
+        while True:
+            with self._lock:
+                wait = self._paused_until - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        self.requests.acquire(1)
+        self.tokens.acquire(tokens)
+
+    def record_rate_limit(self, retry_after: float) -> None:
+        with self._lock:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._scale(self.BACKOFF_FACTOR)
+
+    def record_success(self) -> None:
+        if self.requests.rate_per_minute < self.max_rpm:
+            self._scale(self.RECOVERY_FACTOR)
+
+    def _scale(self, factor: float) -> None:
+        for bucket, ceiling in ((self.requests, self.max_rpm), (self.tokens, self.max_tpm)):
+            rate = bucket.rate_per_minute * factor
+            bucket.set_rate(max(ceiling * self.MIN_FRACTION, min(ceiling, rate)))
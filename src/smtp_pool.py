@@ -0,0 +1,265 @@
+"""
+Bulk email delivery over a pool of reused SMTP sessions.
+
+Each session is connected, upgraded with STARTTLS and logged in once, then
+reused for many messages, so a large send pays the handshake cost once per
+connection instead of once per message. Failed sends are retried with
+exponential backoff; permanent (5xx) rejections are not, and a permanent
+failure to connect or log in stops the whole send.
+
+For local testing point SMTP_HOST/SMTP_PORT at a stand-in server such as
+`python -m aiosmtpd -n -l localhost:8025` and set SMTP_STARTTLS=0 with no
+SMTP_USER, which skips STARTTLS and login.
+"""
+import csv
+import os
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_CONNECTIONS = 4
+# Many providers close a session after ~100 messages; recycle before that
+MAX_MESSAGES_PER_CONNECTION = 100
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+
+
+class SMTPSettings:
+    def __init__(self, host: str, port: int = 587, user: Optional[str] = None, password: Optional[str] = None,
+                 sender: Optional[str] = None, starttls: bool = True, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sender = sender
+        self.starttls = starttls
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> "SMTPSettings":
+        """Read SMTP_HOST/PORT/USER/PASS, EMAIL_SENDER and SMTP_STARTTLS (default on)."""
+        missing = [k for k in ("SMTP_HOST", "EMAIL_SENDER") if not os.getenv(k)]
+        if missing:
+            raise RuntimeError(f"Missing required env vars: {', '.join(missing)}")
+        return cls(
+            host=os.getenv("SMTP_HOST"),
+            port=int(os.getenv("SMTP_PORT", "587")),
+            user=os.getenv("SMTP_USER") or None,
+            password=os.getenv("SMTP_PASS") or None,
+            sender=os.getenv("EMAIL_SENDER"),
+            starttls=os.getenv("SMTP_STARTTLS", "1").lower() not in ("0", "false", "no"),
+        )
+
+
+class OutgoingEmail:
+    def __init__(self, recipient: str, subject: str, text: str, html: Optional[str] = None,
+                 name: Optional[str] = None):
+        self.recipient = recipient
+        self.subject = subject
+        self.text = text
+        self.html = html
+        self.name = name
+
+    def as_mime(self, sender: str) -> str:
+        msg = MIMEMultipart("alternative")
+        msg["From"] = sender
+        msg["To"] = formataddr((self.name, self.recipient)) if self.name else self.recipient
+        msg["Subject"] = self.subject
+        msg.attach(MIMEText(self.text, "plain"))
+        if self.html:
+            msg.attach(MIMEText(self.html, "html"))
+        return msg.as_string()
+
+
+class SMTPConnectionPool:
+    """
+    Up to `size` authenticated SMTP sessions shared by the sending threads.
+    A session that raised is closed rather than returned, so the next
+    checkout reconnects.
+    """
+
+    def __init__(self, settings: SMTPSettings, size: int = DEFAULT_CONNECTIONS,
+                 max_messages: int = MAX_MESSAGES_PER_CONNECTION):
+        self.settings = settings
+        self.max_messages = max_messages
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, int]]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.opened = 0
+        # Set when connecting fails permanently (bad credentials, refused sender host, ...)
+        self.connect_error: Optional[Exception] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        s = self.settings
+        server = None
+        try:
+            server = smtplib.SMTP(s.host, s.port, timeout=s.timeout)
+            if s.starttls:
+                server.starttls(context=ssl.create_default_context())
+            if s.user:
+                server.login(s.user, s.password or "")
+        except Exception as e:
+            if server is not None:
+                _quietly_close(server)
+            if is_permanent(e):
+                self.connect_error = e
+            raise
+        with self._lock:
+            self.opened += 1
+        return server
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        self._slots.acquire()
+        server, sent = None, 0
+        try:
+            try:
+                server, sent = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+            yield server
+            sent += 1
+        except Exception as e:
+            if server is not None and not _session_survives(e):
+                _quietly_close(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                if sent >= self.max_messages:
+                    _quietly_close(server)
+                else:
+                    self._idle.put((server, sent))
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quietly_close(server)
+
+
+def _session_survives(error: Exception) -> bool:
+    # smtplib resets the session after a refused sender/recipient/message, so it can be reused
+    return isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError))
+
+
+def _quietly_close(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def is_permanent(error: Exception) -> bool:
+    """
+    5xx replies (bad address, rejected content, bad credentials) and a server
+    without STARTTLS/AUTH or with an unverifiable certificate will fail again;
+    everything else may be transient.
+    """
+    if isinstance(error, (smtplib.SMTPNotSupportedError, ssl.SSLCertVerificationError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class DeliveryReport:
+    def __init__(self):
+        self.sent = 0
+        self.retries = 0
+        self.failed: List[Tuple[str, str]] = []
+        self.elapsed = 0.0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def record_sent(self) -> None:
+        with self._lock:
+            self.sent += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self, recipient: str, error: Exception) -> None:
+        with self._lock:
+            self.failed.append((recipient, str(error)))
+
+    @property
+    def throughput(self) -> float:
+        """Delivered messages per second."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.sent} sent, {len(self.failed)} failed, {self.retries} retries over "
+            f"{self.connections} SMTP connections in {self.elapsed:.1f}s ({self.throughput:.1f} msg/s)"
+        )
+
+
+class BulkSender:
+    """Send many emails in parallel through one connection pool, retrying transient failures."""
+
+    def __init__(self, settings: SMTPSettings, connections: int = DEFAULT_CONNECTIONS,
+                 max_retries: int = MAX_RETRIES, backoff: float = BACKOFF_SECONDS):
+        self.settings = settings
+        self.connections = connections
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pool = SMTPConnectionPool(settings, connections)
+
+    def _deliver(self, email: OutgoingEmail, report: DeliveryReport) -> None:
+        body = email.as_mime(self.settings.sender)
+        for attempt in range(self.max_retries + 1):
+            if self.pool.connect_error is not None:
+                # Every other connection would be refused the same way; stop instead of retrying
+                report.record_failure(email.recipient, self.pool.connect_error)
+                return
+            try:
+                with self.pool.connection() as server:
+                    server.sendmail(self.settings.sender, [email.recipient], body)
+                report.record_sent()
+                return
+            except Exception as e:
+                if is_permanent(e) or attempt == self.max_retries:
+                    report.record_failure(email.recipient, e)
+                    return
+                report.record_retry()
+                # Exponential backoff with jitter so parallel workers do not retry in lockstep
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    def send_all(self, emails: Iterable[OutgoingEmail]) -> DeliveryReport:
+        report = DeliveryReport()
+        started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.connections) as pool:
+                for future in [pool.submit(self._deliver, email, report) for email in emails]:
+                    future.result()
+        finally:
+            self.pool.close()
+        report.elapsed = time.monotonic() - started
+        report.connections = self.pool.opened
+        return report
+
+
+def read_recipients(path: str) -> List[Dict[str, str]]:
+    """Recipients CSV with an `email` column and optional `location` / `name` columns."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [{k.strip().lower(): (v or "").strip() for k, v in row.items() if k} for row in csv.DictReader(f)]
+    return [row for row in rows if row.get("email")]
@@ -0,0 +1,100 @@
+import json
+import os
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from llm_cache import cache_disabled, cache_key, get_cache
+from llm_generator import clean_json_response, client
+from news_api import load_config
+from structured_output import supports_structured_outputs
+
+# Cheap, fast model that only ranks candidates; drafting still uses LLM_MODEL
+TRIAGE_MODEL = os.getenv("TRIAGE_MODEL", "gpt-4o-mini")
+# Bump whenever the ranking prompt below changes so cached rankings are not reused
+TRIAGE_PROMPT_VERSION = 1
+# Description characters per candidate sent to the ranker
+MAX_DESCRIPTION_CHARS = 600
+
+
+class CandidateFit(BaseModel):
+    index: int
+    issue: str
+    fit: int = Field(description="0 (off-message) to 10 (ideal fundraising hook)")
+
+
+class CandidateRanking(BaseModel):
+    candidates: List[CandidateFit]
+
+
+def priority_issues():
+    """campaign_preferences.priority_issues from config/settings.yaml."""
+    return (load_config().get("campaign_preferences") or {}).get("priority_issues") or []
+
+
+def build_triage_prompt(articles, issues):
+    listing = "\n\n".join(
+        f"[{i}] {a.get('title') or ''}\n{(a.get('description') or '')[:MAX_DESCRIPTION_CHARS]}"
+        for i, a in enumerate(articles)
+    )
+    return f"""
+You are screening news stories for a Democratic campaign's daily fundraising email.
+
+The campaign's priority issues are: {", ".join(issues) or "any national issue"}.
+
+For every candidate below, name its main issue and rate from 0 to 10 how well it fits the
+priority issues as the hook for an urgent, emotional donor email contrasting Democrats with
+Trump and the GOP. Rate every candidate, using its [index].
+
+Use this JSON format in your response (no markdown or code blocks):
+
+{{"candidates": [{{"index": 0, "issue": "name of issue", "fit": 7}}]}}
+
+CANDIDATES:
+
+{listing}
+"""
+
+
+def _request_ranking(prompt, model):
+    kwargs = {"model": model, "messages": [{"role": "user", "content": prompt}], "temperature": 0}
+    if supports_structured_outputs(model):
+        response = client.beta.chat.completions.parse(response_format=CandidateRanking, **kwargs)
+        return response.choices[0].message.parsed
+    response = client.chat.completions.create(**kwargs)
+    return CandidateRanking.model_validate(json.loads(clean_json_response(response.choices[0].message.content)))
+
+
+def rank_candidates(articles, issues=None, model=None, use_cache=True):
+    """
+    Order articles best-first by fit with the priority issues, using one
+    call to the triage model (default TRIAGE_MODEL) for the whole list.
+    Ties and candidates the model skipped keep their original order; if
+    the call fails, the original order is returned unchanged.
+    """
+    if len(articles) < 2:
+        return list(articles)
+    issues = priority_issues() if issues is None else issues
+    model = model or TRIAGE_MODEL
+    prompt = build_triage_prompt(articles, issues)
+    use_cache = use_cache and not cache_disabled()
+    key = cache_key(model, TRIAGE_PROMPT_VERSION, prompt)
+
+    fits = get_cache().get(key) if use_cache else None
+    if fits is None:
+        try:
+            ranking = _request_ranking(prompt, model)
+        except Exception as e:
+            print(f"⚠️ Triage failed ({e}); keeping the original article order")
+            return list(articles)
+        if ranking is None:
+            print("⚠️ Triage model returned no ranking; keeping the original article order")
+            return list(articles)
+        fits = {str(c.index): c.fit for c in ranking.candidates if 0 <= c.index < len(articles)}
+        if use_cache:
+            get_cache().set(key, fits)
+
+    order = sorted(range(len(articles)), key=lambda i: -fits.get(str(i), -1))
+    for rank, i in enumerate(order, 1):
+        print(f"  {rank}. fit {fits.get(str(i), '?')}: {articles[i].get('title') or ''}")
+    return [articles[i] for i in order]
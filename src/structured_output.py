@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+# Model families that accept json_schema response formats (structured outputs)
+STRUCTURED_OUTPUT_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+
+
+def supports_structured_outputs(model: str) -> bool:
+    # The original gpt-4o snapshot (gpt-4o-2024-05-13) predates structured outputs
+    return model.startswith(STRUCTURED_OUTPUT_PREFIXES) and model != "gpt-4o-2024-05-13"
+
+
+def json_schema_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """response_format for APIs that take a raw dict (e.g. Batch API request bodies)."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "strict": True, "schema": model.model_json_schema()},
+    }
+
+
+class ParseStats:
+    """
+    Thread-safe counts of model replies that did or did not parse into the
+    expected shape. Refusals (structured outputs' `refusal` field) are counted
+    separately from malformed replies.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.replies = 0
+        self.failures = 0
+        self.refusals = 0
+
+    def record(self, ok: bool, refusal: bool = False) -> None:
+        with self._lock:
+            self.replies += 1
+            if not ok:
+                self.failures += 1
+            if refusal:
+                self.refusals += 1
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.replies if self.replies else 0.0
+
+    def summary(self) -> str:
+        text = f"{self.failures}/{self.replies} replies failed to parse ({self.failure_rate:.1%})"
+        return f"{text}, {self.refusals} refusals" if self.refusals else text
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import io
+import mmap
+import os
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MAX_SCORE = 5
+CHUNK_ROWS = 50_000
+# Bytes of CSV each worker reads and parses itself
+SHARD_BYTES = 4 * 1024 * 1024
+DEFAULT_CSV = os.path.join(os.path.dirname(__file__), "tagged_emails2.csv")
+# Optional last column saying who produced a row's scores; CSVs without it are all LLM-tagged
+ORIGIN_COLUMN = "label_origin"
+LLM_ORIGIN = "llm"
+LOCAL_ORIGIN = "local"
+
+
+# ---------------------------
+# Loading
+# ---------------------------
+def _to_matrix(rows: List[List[str]], n_categories: int) -> np.ndarray:
+    """Parse the score columns of CSV rows into a compact uint8 matrix (bad cells become 0)."""
+    # Fast path: well-formed rows are converted by NumPy in one call
+    if all(len(row) > n_categories for row in rows):
+        try:
+            values = np.array([cell for row in rows for cell in row[1 : n_categories + 1]], dtype=np.int16)
+        except (ValueError, OverflowError):
+            pass  # a blank or non-numeric cell; fall back to cell-by-cell parsing
+        else:
+            return np.clip(values, 0, MAX_SCORE).astype(np.uint8).reshape(len(rows), n_categories)
+
+    matrix = np.zeros((len(rows), n_categories), dtype=np.uint8)
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row[1 : n_categories + 1]):
+            try:
+                matrix[i, j] = max(0, min(MAX_SCORE, int(cell)))
+            except ValueError:
+                pass
+    return matrix
+
+
+def _categories(header: List[str]) -> List[str]:
+    """Score columns of a header row: everything after the subject except a trailing ORIGIN_COLUMN."""
+    categories = header[1:]
+    return categories[:-1] if categories and categories[-1] == ORIGIN_COLUMN else categories
+
+
+def row_origin(row: List[str], n_categories: int) -> str:
+    """Who scored a row: the ORIGIN_COLUMN cell after the scores, LLM_ORIGIN when there is none."""
+    return (row[n_categories + 1].strip() if len(row) > n_categories + 1 else "") or LLM_ORIGIN
+
+
+def iter_chunks(path: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[List[str], int, List[List[str]]]]:
+    """Yield (categories, first_row_index, rows) chunks of a Subject + scores CSV."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        categories = _categories(header)
+        chunk: List[List[str]] = []
+        start = 0
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield categories, start, chunk
+                start += len(chunk)
+                chunk = []
+        if chunk:
+            yield categories, start, chunk
+
+
+def load_scores(path: str, llm_only: bool = False) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Load a whole tagged CSV as (subjects, categories, uint8 score matrix).
+    With llm_only, rows scored by the local pre-filter are left out.
+    """
+    subjects: List[str] = []
+    categories: List[str] = []
+    blocks = []
+    for categories, _, rows in iter_chunks(path):
+        if llm_only:
+            rows = [row for row in rows if row_origin(row, len(categories)) != LOCAL_ORIGIN]
+        subjects.extend(row[0] if row else "" for row in rows)
+        blocks.append(_to_matrix(rows, len(categories)))
+    matrix = np.vstack(blocks) if blocks else np.zeros((0, len(categories)), dtype=np.uint8)
+    return subjects, categories, matrix
+
+
+def _read_header(path: str) -> Tuple[List[str], int]:
+    """Categories from the header row and the byte offset where data rows start."""
+    with open(path, "rb") as f:
+        line = f.readline()
+        header = next(csv.reader([line.decode("utf-8-sig")]), None)
+        return _categories(header or []), f.tell()
+
+
+def shard_ranges(path: str, start: int, shard_bytes: int = SHARD_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split the bytes of a CSV from `start` to EOF into ranges of roughly
+    shard_bytes that each begin at a row boundary. A newline only ends a row
+    when an even number of quotes precedes it, so quoted multi-line subjects
+    are never cut in half. Only quotes and newlines are located here (with
+    NumPy); the rows themselves are parsed by the workers.
+    """
+    size = os.path.getsize(path)
+    if size - start <= shard_bytes:
+        return [(start, size)] if size > start else []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            quotes = np.flatnonzero(data == ord('"'))
+            newlines = np.flatnonzero(data == ord("\n"))
+            row_ends = newlines[(np.searchsorted(quotes, newlines) % 2 == 0) & (newlines >= start)] + 1
+        finally:
+            del data  # release the buffer before the mmap closes
+    if not len(row_ends):
+        return [(start, size)]
+    targets = np.arange(start + shard_bytes, size, shard_bytes)
+    cuts = np.unique(row_ends[np.minimum(np.searchsorted(row_ends, targets), len(row_ends) - 1)])
+    bounds = [start] + [int(c) for c in cuts if start < c < size] + [size]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# ---------------------------
+# Per-shard aggregation
+# ---------------------------
+def _top_k(matrix: np.ndarray, k: int) -> np.ndarray:
+    """Row indices of the k highest scores per category (ties keep file order); shape (C, <=k)."""
+    order = np.argsort(-matrix.astype(np.int16), axis=0, kind="stable")
+    return order[:k].T
+
+
+def _summarize_shard(args: Tuple[str, int, int, int, int, int]) -> Dict[str, Any]:
+    """Read, parse and aggregate one byte range; top entries carry shard-local row numbers."""
+    path, begin, end, n_categories, top_k, threshold = args
+    with open(path, "rb") as f:
+        f.seek(begin)
+        text = f.read(end - begin).decode("utf-8")
+    rows = list(csv.reader(io.StringIO(text, newline="")))
+    matrix = _to_matrix(rows, n_categories)
+
+    offsets = (np.arange(n_categories) * (MAX_SCORE + 1)).astype(np.int64)
+    distribution = np.bincount(
+        (matrix.astype(np.int64) + offsets).ravel(),
+        minlength=n_categories * (MAX_SCORE + 1),
+    ).reshape(n_categories, MAX_SCORE + 1)
+
+    relevant = (matrix >= threshold).astype(np.int64)
+    cooccurrence = relevant.T @ relevant
+
+    top = _top_k(matrix, top_k)
+    candidates = [
+        [(int(matrix[r, c]), int(r), rows[r][0] if rows[r] else "") for r in top[c]]
+        for c in range(n_categories)
+    ]
+    return {
+        "rows": len(rows),
+        "distribution": distribution,
+        "cooccurrence": cooccurrence,
+        "top": candidates,
+    }
+
+
+def _merge(categories: List[str], partials: Iterator[Dict[str, Any]], top_k: int) -> Dict[str, Any]:
+    n_categories = len(categories)
+    summary: Dict[str, Any] = {
+        "categories": categories,
+        "rows": 0,
+        "distribution": np.zeros((n_categories, MAX_SCORE + 1), dtype=np.int64),
+        "cooccurrence": np.zeros((n_categories, n_categories), dtype=np.int64),
+        "top": [[] for _ in range(n_categories)],
+    }
+    for part in partials:
+        # Shards arrive in file order, so the rows seen so far give this shard's first row number
+        offset = summary["rows"]
+        summary["rows"] += part["rows"]
+        summary["distribution"] += part["distribution"]
+        summary["cooccurrence"] += part["cooccurrence"]
+        for c in range(n_categories):
+            shifted = [(score, offset + row, subject) for score, row, subject in part["top"][c]]
+            merged = summary["top"][c] + shifted
+            # Highest score first, earlier rows first among ties
+            summary["top"][c] = sorted(merged, key=lambda item: (-item[0], item[1]))[:top_k]
+    return summary
+
+
+def summarize_csv(
+    path: str,
+    workers: Optional[int] = None,
+    top_k: int = 5,
+    threshold: int = 3,
+    shard_bytes: int = SHARD_BYTES,
+) -> Dict[str, Any]:
+    """
+    Summarize a tagged-email CSV: per-category score distributions (C x 6),
+    co-occurrence counts of categories scored >= threshold (C x C) and the
+    top_k (score, row, subject) entries per category.
+
+    The file is split into byte ranges of about shard_bytes (see shard_ranges);
+    each worker process reads, parses and aggregates its own range, so only
+    the small per-shard summaries cross process boundaries. Files of a single
+    shard are handled in-process.
+    """
+    categories, data_start = _read_header(path)
+    if not categories:
+        return _merge([], iter(()), top_k)
+    jobs = [
+        (path, begin, end, len(categories), top_k, threshold)
+        for begin, end in shard_ranges(path, data_start, shard_bytes)
+    ]
+    if workers == 1 or len(jobs) <= 1:
+        return _merge(categories, map(_summarize_shard, jobs), top_k)
+    with Pool(processes=min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+        return _merge(categories, pool.imap(_summarize_shard, jobs), top_k)
+
+
+# ---------------------------
+# Report
+# ---------------------------
+def print_report(summary: Dict[str, Any], threshold: int = 3) -> None:
+    categories = summary["categories"]
+    print(f"📊 {summary['rows']} tagged emails, {len(categories)} categories\n")
+
+    print("Score distribution (count of emails per score 0-5):")
+    for name, counts in zip(categories, summary["distribution"]):
+        print(f"  {name:<26} " + " ".join(f"{int(n):>6}" for n in counts))
+
+    print(f"\nMost frequent category pairs (both scored ≥ {threshold}):")
+    co = summary["cooccurrence"]
+    pairs = [(int(co[i, j]), categories[i], categories[j])
+             for i in range(len(categories)) for j in range(i + 1, len(categories)) if co[i, j]]
+    for count, a, b in sorted(pairs, reverse=True)[:10]:
+        print(f"  {count:>6}  {a} + {b}")
+
+    print("\nTop emails per category:")
+    for name, top in zip(categories, summary["top"]):
+        hits = [item for item in top if item[0] >= threshold]
+        if not hits:
+            continue
+        print(f"  {name}:")
+        for score, row, subject in hits:
+            print(f"    {score}  #{row + 1}  {subject}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize tagged-email score CSVs.")
+    parser.add_argument("csv", nargs="?", default=DEFAULT_CSV, help="Subject + category scores CSV")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--top-k", type=int, default=5, help="emails listed per category")
+    parser.add_argument("--threshold", type=int, default=3, help="score that counts as a category hit")
+    parser.add_argument("--shard-mb", type=float, default=SHARD_BYTES / 2**20, help="megabytes of CSV per shard")
+    args = parser.parse_args(argv)
+
+    summary = summarize_csv(args.csv, args.workers, args.top_k, args.threshold, int(args.shard_mb * 2**20))
+    print_report(summary, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Issue tagging for campaign emails and text messages.
+
+    from tagging import SOURCES, Tagger
+    tagger = Tagger(source=SOURCES["sms"])
+    for item, scores in tagger.run(SOURCES["sms"].load("messages.json"), mode="packed"):
+        ...
+
+Command line: python -m tagging --help (from src/) or scripts/tag_items.py.
+"""
+from tagging.client import DEFAULT_MODEL, get_client
+from tagging.engine import MODES, Tagger
+from tagging.schema import DEFAULT_SCHEMA, TagSchema, load_schema
+from tagging.sources import SOURCES, ItemSource
+
+__all__ = [
+    "DEFAULT_MODEL",
+    "DEFAULT_SCHEMA",
+    "ItemSource",
+    "MODES",
+    "SOURCES",
+    "TagSchema",
+    "Tagger",
+    "get_client",
+    "load_schema",
+]
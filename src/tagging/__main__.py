@@ -0,0 +1,3 @@
+from tagging.cli import main
+
+main()
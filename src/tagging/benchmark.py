@@ -0,0 +1,107 @@
+import argparse
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from rate_limiter import RateLimiter
+from tagging.client import DEFAULT_MODEL
+from tagging.engine import DEFAULT_PACK_SIZE, MODES, Tagger
+from tagging.prompts import DEFAULT_LAYOUT, PROMPT_LAYOUTS
+from tagging.schema import DEFAULT_SCHEMA, TagSchema
+from tagging.sources import SOURCES, Item
+
+# Batch API runs take minutes to hours, so they are only benchmarked on request
+DEFAULT_MODES = ["sync", "packed"]
+
+
+def compare_scores(
+    schema: TagSchema,
+    items: List[Item],
+    baseline: List[Optional[Dict[str, int]]],
+    candidate: List[Optional[Dict[str, int]]],
+) -> Dict[str, Any]:
+    """Agreement between two runs' normalized scores over the items both runs tagged."""
+    pairs = [(item, b, c) for item, b, c in zip(items, baseline, candidate) if b and c]
+    if not pairs:
+        return {"compared": 0, "failed": len(items)}
+    a = np.array([[b[k] for k in schema.keys] for _, b, _ in pairs])
+    b = np.array([[c[k] for k in schema.keys] for _, _, c in pairs])
+    diff = np.abs(a - b)
+    drifted = [
+        (item["label"], {k: (x[k], y[k]) for k in schema.keys if x[k] != y[k]})
+        for (item, x, y), row in zip(pairs, diff) if row.any()
+    ]
+    return {
+        "compared": len(pairs),
+        "failed": len(items) - len(pairs),
+        "exact_agreement": float((diff == 0).mean()),
+        "within_one": float((diff <= 1).mean()),
+        "item_exact_agreement": float((~diff.any(axis=1)).mean()),
+        "max_abs_diff": int(diff.max()),
+        "drifted": drifted,
+    }
+
+
+def run_variant(tagger: Tagger, items: List[Item], mode: str, **options: Any) -> Dict[str, Any]:
+    """Tag items with one mode on a fresh tagger; returns scores, timing and token usage."""
+    started = time.monotonic()
+    results = [scores for _, scores in tagger.run(items, mode=mode, **options)]
+    elapsed = time.monotonic() - started
+    return {
+        "results": results,
+        "seconds": elapsed,
+        "items_per_minute": len(items) * 60 / max(elapsed, 1e-9),
+        "usage": tagger.usage.as_dict(),
+        "parse_failure_rate": tagger.parse_stats.failure_rate,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tagging modes on the same sample of items.")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="sms")
+    parser.add_argument("--input", help="items to sample (default depends on --source)")
+    parser.add_argument("--sample", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=DEFAULT_MODES, choices=MODES)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pack-size", type=int, default=DEFAULT_PACK_SIZE)
+    parser.add_argument("--prompt-layout", choices=PROMPT_LAYOUTS, default=DEFAULT_LAYOUT)
+    parser.add_argument("--rpm", type=float, default=60)
+    parser.add_argument("--tpm", type=float, default=90_000)
+    args = parser.parse_args(argv)
+
+    source = SOURCES[args.source]
+    items = list(itertools.islice(source.load(args.input or source.default_input), args.sample))
+    runs = {}
+    for mode in args.modes:
+        print(f"\n🔄 {mode}: tagging {len(items)} {source.name}...")
+        tagger = Tagger(
+            source=source, model=args.model, layout=args.prompt_layout,
+            limiter=RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm),
+        )
+        runs[mode] = run_variant(tagger, items, mode, workers=args.workers, pack_size=args.pack_size)
+
+    print(f"\n📊 {len(items)} {source.name}, {args.model}:")
+    print(f"  {'mode':<7} {'items/min':>9} {'requests':>8} {'prompt tok':>10} {'cached':>7} {'completion':>10} {'failed':>6} {'bad JSON':>8}")
+    for mode, run in runs.items():
+        usage = run["usage"]
+        failed = sum(r is None for r in run["results"])
+        print(
+            f"  {mode:<7} {run['items_per_minute']:>9.0f} {usage['requests']:>8} {usage['prompt_tokens']:>10} "
+            f"{usage['cache_hit_rate']:>7.1%} {usage['completion_tokens']:>10} {failed:>6} {run['parse_failure_rate']:>8.1%}"
+        )
+
+    baseline = args.modes[0]
+    for mode in args.modes[1:]:
+        report = compare_scores(DEFAULT_SCHEMA, items, runs[baseline]["results"], runs[mode]["results"])
+        if report["compared"]:
+            print(
+                f"  {mode} vs {baseline}: {report['exact_agreement']:.1%} identical scores, "
+                f"{report['within_one']:.1%} within one ({report['compared']} items)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import csv
+import json
+import os
+import time
+from typing import List, Optional, Set
+
+from llm_cache import cache_disabled, get_cache
+from local_classifier import LocalClassifier, Prefilter
+from rate_limiter import RateLimiter
+from tag_analytics import LLM_ORIGIN, ORIGIN_COLUMN
+from tagging.client import DEFAULT_MODEL
+from tagging.engine import BATCH_DIR, DEFAULT_PACK_SIZE, MODES, Tagger
+from tagging.prompts import DEFAULT_LAYOUT, PROMPT_LAYOUTS
+from tagging.schema import load_schema
+from tagging.sources import SOURCES, message_item
+
+
+# ---------------------------
+# Checkpointing
+# ---------------------------
+def checkpoint_path(output_csv: str) -> str:
+    return output_csv + ".checkpoint"
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """IDs already tagged; each line is an ID, optionally followed by a tab and the label origin."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.split("\t", 1)[0].strip() for line in f if line.strip()}
+
+
+def read_header(path: str) -> List[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+# ---------------------------
+# Main
+# ---------------------------
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tag campaign emails or text messages with 0-5 issue scores.")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="emails", help="kind of items to tag")
+    parser.add_argument("--input", help="items to tag (default depends on --source)")
+    parser.add_argument("--output", help="CSV to write scores to (default depends on --source)")
+    parser.add_argument("--text", help="tag this one text and print its scores instead of reading --input")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="chat model used for tagging")
+    parser.add_argument("--schema", help="JSON/YAML file with the categories to score (default: built-in list)")
+    parser.add_argument(
+        "--no-structured", action="store_true",
+        help="parse free-text JSON replies instead of using schema-constrained structured outputs",
+    )
+    parser.add_argument(
+        "--mode", choices=MODES, default="sync",
+        help="sync sends one request per item; packed scores --pack-size items per request; "
+             "batch submits everything through the Batch API",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="concurrent tagging requests (sync mode)")
+    parser.add_argument("--pack-size", type=int, default=DEFAULT_PACK_SIZE, help="items per request (packed mode)")
+    parser.add_argument("--rpm", type=float, default=60, help="request budget per minute")
+    parser.add_argument("--tpm", type=float, default=90_000, help="token budget per minute")
+    parser.add_argument("--dedup", action="store_true", help="tag exact and near-duplicate items once")
+    parser.add_argument("--cache", action="store_true", help="reuse scores from the on-disk LLM response cache")
+    parser.add_argument("--batch-dir", default=BATCH_DIR, help="where Batch API input files are written")
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="seconds between Batch API status checks")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="append to an existing output, skipping items recorded in its checkpoint",
+    )
+    parser.add_argument(
+        "--prefilter-model",
+        help="local classifier (see local_classifier.py train); confident predictions skip the LLM",
+    )
+    parser.add_argument("--min-confidence", type=float, default=0.9, help="prefilter confidence needed to skip the LLM")
+    parser.add_argument(
+        "--prompt-layout", choices=PROMPT_LAYOUTS, default=DEFAULT_LAYOUT,
+        help="prefix puts the item after all static instructions so providers can cache the shared prefix",
+    )
+    parser.add_argument("--verbose", action="store_true", help="print every raw model reply (sync mode)")
+    return parser.parse_args(argv)
+
+
+def build_tagger(args: argparse.Namespace) -> Tagger:
+    prefilter = None
+    if args.prefilter_model:
+        prefilter = Prefilter(LocalClassifier.load(args.prefilter_model), args.min_confidence)
+    return Tagger(
+        source=SOURCES[args.source],
+        schema=load_schema(args.schema),
+        model=args.model,
+        limiter=RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm),
+        layout=args.prompt_layout,
+        prefilter=prefilter,
+        cache=get_cache() if args.cache and not cache_disabled() else None,
+        structured=False if args.no_structured else None,
+        verbose=args.verbose,
+    )
+
+
+def print_run_stats(tagger: Tagger, processed: int, elapsed: float) -> None:
+    print(f"⏱️ {processed} items in {elapsed:.1f}s ({processed * 60 / max(elapsed, 1e-9):.0f} items/min)")
+    if tagger.usage.requests:
+        print(f"🧮 Token usage ({tagger.layout} layout): {tagger.usage.summary()}")
+    if tagger.parse_stats.replies:
+        mode = "structured outputs" if tagger.structured else "free-text JSON"
+        print(f"🧾 Parsing ({mode}): {tagger.parse_stats.summary()}")
+    if tagger.cache_hits:
+        print(f"💾 {tagger.cache_hits} items served from the response cache")
+    if tagger.limiter.rate_limited:
+        print(f"⏳ Hit {tagger.limiter.rate_limited} rate limit responses")
+    if tagger.prefilter:
+        print(f"🧠 Prefilter answered {tagger.prefilter.local} items locally; {tagger.prefilter.remote} went to the LLM")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    source = SOURCES[args.source]
+    tagger = build_tagger(args)
+
+    if args.text:
+        item = {**message_item(args.text), "subject": "", "body": args.text}
+        print(json.dumps(tagger.tag(item), indent=2))
+        return
+
+    # Items are streamed from disk, so tagging starts with the first record
+    input_path = args.input or source.default_input
+    output_path = args.output or source.default_output
+    if not os.path.exists(input_path):
+        print(f"❌ Failed to load {source.name} from file: {input_path} not found")
+        return
+    items = source.load(input_path)
+    print(f"✅ Streaming {source.name} from {input_path}")
+
+    checkpoint = checkpoint_path(output_path)
+    done = load_checkpoint(checkpoint) if args.resume else set()
+    if done:
+        print(f"⏩ Resuming: {len(done)} items already tagged")
+    todo = (item for item in items if item["id"] not in done)
+
+    # Rows are appended as they complete; the checkpoint records each item
+    # only after its row is flushed, so a crash never loses paid-for work.
+    # The origin column keeps pre-filter predictions apart from LLM labels (see local_classifier.training_data)
+    fieldnames = [source.label_field] + tagger.schema.keys + [ORIGIN_COLUMN]
+    append = args.resume and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+    if append and ORIGIN_COLUMN not in read_header(output_path):
+        if tagger.prefilter:
+            print(f"❌ {output_path} has no {ORIGIN_COLUMN} column, so local predictions could not be told "
+                  "apart from LLM labels; resume without --prefilter-model or tag into a new --output")
+            return
+        fieldnames.remove(ORIGIN_COLUMN)  # an older output: every row in it is an LLM label
+    saved = skipped = 0
+    started = time.monotonic()
+    try:
+        with open(output_path, "a" if append else "w", newline="", encoding="utf-8") as out, \
+                open(checkpoint, "a" if args.resume else "w", encoding="utf-8") as ckpt:
+            # Appending to an output without the origin column just leaves it out
+            writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+            if not append:
+                writer.writeheader()
+
+            print(f"\n🔄 Tagging {source.name} ({args.mode} mode, {args.model})...")
+            tagged = tagger.run(
+                todo, mode=args.mode, workers=args.workers, pack_size=args.pack_size, dedup=args.dedup,
+                batch_dir=args.batch_dir, poll_interval=args.poll_interval,
+            )
+            for item, scores in tagged:
+                if not scores:
+                    skipped += 1
+                    print(f"⚠️ Skipping '{item['label'][:60]}' due to error.")
+                    continue
+                origin = item.get(ORIGIN_COLUMN, LLM_ORIGIN)
+                writer.writerow({source.label_field: item["label"], **scores, ORIGIN_COLUMN: origin})
+                out.flush()
+                ckpt.write(f"{item['id']}\t{origin}\n")
+                ckpt.flush()
+                saved += 1
+    except Exception as e:
+        print(f"❌ Failed to write CSV: {e}")
+        return
+
+    print_run_stats(tagger, saved + skipped, time.monotonic() - started)
+    if skipped:
+        print(f"⚠️ {skipped} items failed; rerun with --resume to retry them.")
+    print(f"✅ Done! Saved {saved} new results to '{output_path}'")
@@ -0,0 +1,30 @@
+import os
+import threading
+from typing import Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import OpenAI
+
+load_dotenv()
+
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+MAX_CONNECTIONS = 32
+
+_client: Optional[OpenAI] = None
+_lock = threading.Lock()
+
+
+def get_client() -> OpenAI:
+    """One OpenAI client for the whole process, with a connection pool sized for the tagging workers."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=httpx.Client(
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                    limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+                ),
+            )
+    return _client
@@ -0,0 +1,354 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from openai import ContentFilterFinishReasonError, LengthFinishReasonError, OpenAI, RateLimitError
+from pydantic import ValidationError
+
+from batch_api import run_batches
+from dedup import cluster_texts
+from llm_cache import LLMCache, cache_key
+from local_classifier import Prefilter
+from rate_limiter import RateLimiter
+from structured_output import ParseStats, json_schema_format, supports_structured_outputs
+from tag_analytics import LOCAL_ORIGIN, ORIGIN_COLUMN
+from tagging.client import DEFAULT_MODEL, get_client
+from tagging.prompts import DEFAULT_LAYOUT, build_packed_prompt, build_prompt, chat_messages
+from tagging.schema import DEFAULT_SCHEMA, TagSchema, extract_json
+from tagging.sources import SOURCES, SRC_DIR, Item, ItemSource
+from token_usage import TokenUsage
+
+# Bump when prompts change in a way that should invalidate cached scores
+TAG_PROMPT_VERSION = 1
+
+MODES = ("sync", "packed", "batch")
+BATCH_DIR = os.path.join(SRC_DIR, "batch_runs")
+DEFAULT_PACK_SIZE = 10
+MAX_ITEM_ATTEMPTS = 3
+MAX_RATE_LIMIT_RETRIES = 6
+# Rough reply size: 24 integer scores in JSON
+RESPONSE_TOKEN_ESTIMATE = 300
+# Packed replies only list non-zero scores, so each item's entry stays small
+TOKENS_PER_PACKED_ITEM = 60
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+Scores = Dict[str, int]
+Tagged = Tuple[Item, Optional[Scores]]
+
+
+def estimate_tokens(prompt: str, reply_tokens: int = RESPONSE_TOKEN_ESTIMATE) -> int:
+    """Cheap token estimate (~4 characters per token) for the tokens/min budget."""
+    return len(prompt) // 4 + reply_tokens
+
+
+def _retry_after_seconds(error: RateLimitError) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def packed_id(index: int) -> str:
+    return f"m{index}"
+
+
+class Tagger:
+    """
+    Scores items from one source on a schema with one model.
+
+    Every execution mode (threaded requests, packed multi-item requests, the
+    Batch API) goes through the same client, rate limiter, response cache,
+    local pre-filter and token accounting held here, so modes can be swapped
+    and compared on the same input.
+
+    With structured outputs (on by default for models that support them)
+    single-item replies are constrained to the schema's pydantic model, so
+    they cannot fail to parse. Packed replies use JSON mode because their
+    keys are per-request IDs.
+
+    Items scored by the local pre-filter rather than the LLM are marked with
+    item[ORIGIN_COLUMN] = LOCAL_ORIGIN, in every mode and for every duplicate
+    sharing their scores, so writers can keep them apart from LLM labels.
+    """
+
+    def __init__(
+        self,
+        source: ItemSource = SOURCES["emails"],
+        schema: TagSchema = DEFAULT_SCHEMA,
+        model: str = DEFAULT_MODEL,
+        api_client: Optional[OpenAI] = None,
+        limiter: Optional[RateLimiter] = None,
+        layout: str = DEFAULT_LAYOUT,
+        prefilter: Optional[Prefilter] = None,
+        cache: Optional[LLMCache] = None,
+        structured: Optional[bool] = None,
+        verbose: bool = False,
+    ):
+        self.source = source
+        self.schema = schema
+        self.model = model
+        self._client = api_client
+        self.limiter = limiter or RateLimiter()
+        self.layout = layout
+        self.prefilter = prefilter
+        self.cache = cache
+        self.structured = supports_structured_outputs(model) if structured is None else structured
+        self.verbose = verbose
+        self.usage = TokenUsage()
+        self.parse_stats = ParseStats()
+        self.cache_hits = 0
+
+    @property
+    def client(self) -> OpenAI:
+        return self._client or get_client()
+
+    # ---------------------------
+    # Prompts & requests
+    # ---------------------------
+    def prompt(self, item: Item) -> str:
+        return build_prompt(self.schema, self.source.kind, self.source.section(item), self.layout)
+
+    def messages(self, item: Item) -> List[Dict[str, str]]:
+        return chat_messages(self.source.kind, self.prompt(item))
+
+    def complete(self, messages: List[Dict[str, str]], reply_tokens: int = RESPONSE_TOKEN_ESTIMATE,
+                 response_format: Any = None) -> str:
+        """
+        One chat completion behind the shared rate limiter. 429s are retried
+        here (the SDK's own retries are disabled) so the limiter can honour
+        retry-after and slow down. `response_format` is either a dict for
+        chat.completions.create or a pydantic model for structured outputs;
+        a refused structured reply comes back as "".
+        """
+        api_client = self.client.with_options(max_retries=0)
+        tokens = estimate_tokens(messages[-1]["content"], reply_tokens)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire(tokens)
+            try:
+                if isinstance(response_format, type):
+                    resp = api_client.beta.chat.completions.parse(
+                        model=self.model, messages=messages, temperature=0, response_format=response_format
+                    )
+                else:
+                    extra = {"response_format": response_format} if response_format else {}
+                    resp = api_client.chat.completions.create(
+                        model=self.model, messages=messages, temperature=0, **extra
+                    )
+            except RateLimitError as e:
+                if attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = _retry_after_seconds(e) or min(60.0, 2.0 ** attempt)
+                print(f"⏳ Rate limited; retrying in {retry_after:.1f}s")
+                self.limiter.record_rate_limit(retry_after)
+                continue
+            self.limiter.record_success()
+            self.usage.record(getattr(resp, "usage", None))
+            return (resp.choices[0].message.content or "").strip()
+        raise RuntimeError("unreachable")
+
+    def scores_from_reply(self, raw: Optional[str]) -> Optional[Scores]:
+        """Normalized scores from one single-item reply, recording whether it parsed."""
+        if self.structured and raw:
+            try:
+                reply = self.schema.response_model.model_validate_json(raw)
+                scores: Optional[Scores] = self.schema.normalize(reply.model_dump(by_alias=True))
+            except ValidationError as e:
+                print(f"❌ Reply does not match the schema: {e.error_count()} errors")
+                scores = None
+        else:
+            scores = self.schema.scores_from_reply(raw)
+        self.parse_stats.record(scores is not None, refusal=self.structured and not raw)
+        return scores
+
+    # ---------------------------
+    # Cache & pre-filter
+    # ---------------------------
+    def _cache_key(self, item: Item) -> str:
+        return cache_key("tag", TAG_PROMPT_VERSION, self.model, self.schema.categories,
+                         self.schema.max_high, self.source.kind, item["text"])
+
+    def known_scores(self, item: Item) -> Optional[Scores]:
+        """Scores available without an API call: a cached reply or a confident local prediction."""
+        if self.cache is not None:
+            hit = self.cache.get(self._cache_key(item))
+            if hit is not None:
+                self.cache_hits += 1
+                return self.schema.normalize(hit["scores"])
+        if self.prefilter is not None:
+            local = self.prefilter.try_predict(item["text"])
+            if local is not None:
+                item[ORIGIN_COLUMN] = LOCAL_ORIGIN
+                return self.schema.normalize(local)
+        return None
+
+    def _remember(self, item: Item, scores: Optional[Scores]) -> Optional[Scores]:
+        if scores is not None and self.cache is not None:
+            self.cache.set(self._cache_key(item), {"scores": scores})
+        return scores
+
+    # ---------------------------
+    # Execution modes
+    # ---------------------------
+    def tag(self, item: Item) -> Optional[Scores]:
+        """Score one item with its own request; None if the request or its reply failed."""
+        known = self.known_scores(item)
+        if known is not None:
+            return known
+        try:
+            raw = self.complete(
+                self.messages(item), response_format=self.schema.response_model if self.structured else None
+            )
+            if self.verbose:
+                print(f"🟡 Raw reply for {item['label'][:60]!r}:\n{raw}")
+            return self._remember(item, self.scores_from_reply(raw))
+        except (LengthFinishReasonError, ContentFilterFinishReasonError) as e:
+            self.parse_stats.record(False)
+            print(f"❌ Structured reply incomplete: {e.__class__.__name__}")
+            return None
+        except Exception as e:
+            print(f"❌ OpenAI request failed: {e}")
+            return None
+
+    def iter_tagged(self, items: Iterable[Item], workers: int = 4) -> Iterator[Tagged]:
+        """
+        Tag items on a pool of `workers` threads and yield (item, scores) pairs
+        in input order as soon as they are ready. Only a small window of items
+        is in flight, so memory stays flat. Failed items yield None scores.
+        """
+        window = max(1, workers) * 4
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for item in items:
+                pending.append((item, pool.submit(self.tag, item)))
+                if len(pending) >= window:
+                    head, future = pending.popleft()
+                    yield head, future.result()
+            while pending:
+                head, future = pending.popleft()
+                yield head, future.result()
+
+    def _parse_packed_reply(self, raw: Optional[str], ids: List[str]) -> Dict[str, Optional[Scores]]:
+        """Validated scores for each expected ID; missing or invalid entries map to None."""
+        json_text = extract_json(raw or "")
+        parsed = json.loads(json_text) if json_text else None
+        if not isinstance(parsed, dict):
+            return {key: None for key in ids}
+        return {key: self.schema.validate_entry(parsed.get(key)) for key in ids}
+
+    def tag_packed(self, items: List[Item], pack_size: int = DEFAULT_PACK_SIZE) -> List[Optional[Scores]]:
+        """
+        Tag items pack_size at a time, one request per pack, with stable IDs
+        (m<index>) mapping to each item's scores. Items whose entry is missing
+        or invalid are split into smaller packs and retried on their own, up to
+        MAX_ITEM_ATTEMPTS each. Results are in input order; None if never valid.
+        """
+        results: List[Optional[Scores]] = [self.known_scores(item) for item in items]
+        attempts = [0] * len(items)
+        todo = [i for i, scores in enumerate(results) if scores is None]
+        step = max(1, pack_size)
+        pending = deque(todo[j : j + step] for j in range(0, len(todo), step))
+
+        while pending:
+            pack = pending.popleft()
+            ids = {packed_id(i): i for i in pack}
+            prompt = build_packed_prompt(
+                self.schema, self.source.kind, {key: items[i]["text"] for key, i in ids.items()}
+            )
+            try:
+                raw = self.complete(
+                    chat_messages(self.source.kind, prompt),
+                    reply_tokens=len(pack) * TOKENS_PER_PACKED_ITEM,
+                    response_format=JSON_OBJECT_FORMAT,
+                )
+                replies = self._parse_packed_reply(raw, list(ids))
+            except Exception as e:
+                print(f"❌ Packed request for {len(pack)} items failed: {e}")
+                replies = {key: None for key in ids}
+
+            failed = []
+            for key, i in ids.items():
+                attempts[i] += 1
+                self.parse_stats.record(replies[key] is not None)
+                if replies[key] is not None:
+                    results[i] = self._remember(items[i], replies[key])
+                elif attempts[i] < MAX_ITEM_ATTEMPTS:
+                    failed.append(i)
+                else:
+                    print(f"⚠️ Giving up on item {i + 1} after {attempts[i]} attempts")
+            if failed:
+                half = (len(failed) + 1) // 2
+                pending.extend(failed[j : j + half] for j in range(0, len(failed), half))
+        return results
+
+    def iter_packed(self, items: Iterable[Item], pack_size: int = DEFAULT_PACK_SIZE) -> Iterator[Tagged]:
+        items = list(items)
+        yield from zip(items, self.tag_packed(items, pack_size))
+
+    def iter_batch(self, items: Iterable[Item], workdir: str, poll_interval: float = 30.0) -> Iterator[Tagged]:
+        """
+        Tag items through the OpenAI Batch API instead of one request per item.
+        Yields (item, scores) pairs in input order once every batch has finished.
+        Unlike iter_tagged, this holds every item in memory until the batches finish.
+        """
+        items = list(items)
+        known = [self.known_scores(item) for item in items]
+        requests = ((f"item-{i}", self.messages(item)) for i, item in enumerate(items) if known[i] is None)
+        response_format = json_schema_format(self.schema.response_model) if self.structured else None
+        replies = run_batches(
+            self.client, requests, self.model, workdir, temperature=0,
+            poll_interval=poll_interval, response_format=response_format,
+        )
+        for i, item in enumerate(items):
+            if known[i] is not None:
+                yield item, known[i]
+                continue
+            raw = replies.get(f"item-{i}")
+            yield item, self._remember(item, self.scores_from_reply(raw)) if raw else None
+
+    def run(
+        self,
+        items: Iterable[Item],
+        mode: str = "sync",
+        workers: int = 4,
+        pack_size: int = DEFAULT_PACK_SIZE,
+        dedup: bool = False,
+        batch_dir: str = BATCH_DIR,
+        poll_interval: float = 30.0,
+    ) -> Iterator[Tagged]:
+        """
+        Tag items with the chosen mode, yielding (item, scores) in input order.
+        With dedup, exact and near-duplicate items are tagged once and share
+        the scores (this reads every item before tagging starts).
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown tagging mode {mode!r}; expected one of {MODES}")
+
+        def dispatch(batch: Iterable[Item]) -> Iterator[Tagged]:
+            if mode == "packed":
+                return self.iter_packed(batch, pack_size)
+            if mode == "batch":
+                return self.iter_batch(batch, batch_dir, poll_interval)
+            return self.iter_tagged(batch, workers)
+
+        if not dedup:
+            yield from dispatch(items)
+            return
+
+        items = list(items)
+        clusters = cluster_texts([item["text"] for item in items])
+        print(f"🧹 {len(items)} items collapse to {len(clusters)} unique texts")
+        scores_by_index: Dict[int, Optional[Scores]] = {}
+        for cluster, (head, scores) in zip(clusters, dispatch(items[c[0]] for c in clusters)):
+            for i in cluster:
+                scores_by_index[i] = scores
+                if ORIGIN_COLUMN in head:
+                    items[i][ORIGIN_COLUMN] = head[ORIGIN_COLUMN]
+        for i, item in enumerate(items):
+            yield item, scores_by_index[i]
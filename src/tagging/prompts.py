@@ -0,0 +1,158 @@
+from typing import Dict, List
+
+from tagging.schema import TagSchema
+
+# "inline" is the original layout with the item between categories and rules.
+# "prefix" keeps every static section first, adds worked examples, and appends
+# the item last, so all requests share one long identical prefix the provider
+# can serve from its prompt cache.
+PROMPT_LAYOUTS = ("inline", "prefix")
+DEFAULT_LAYOUT = "inline"
+# OpenAI only serves prompt prefixes of at least this many tokens from cache
+MIN_CACHEABLE_TOKENS = 1024
+
+# Scored examples for the prefix layout; one is shown only if every category it
+# scores is in the schema. Unlisted categories are 0.
+WORKED_EXAMPLES = [
+    (
+        "Subject: The Senate votes on the Freedom to Vote Act TONIGHT\n"
+        "Republican legislatures have passed dozens of laws making it harder to vote, from purging rolls to "
+        "closing polling places in Black neighborhoods. Add your name to tell the Senate to pass the bill.",
+        {"Voting Rights": 5, "Racial Equity": 2, "Beat Republicans": 1},
+    ),
+    (
+        "Subject: Our end-of-quarter deadline is MIDNIGHT\n"
+        "We are $42,000 short of our goal and the FEC deadline is hours away. Every dollar you give before "
+        "midnight will be matched, so we can keep fighting to flip the House blue.",
+        {"Urgency/End of Quarter": 5, "Beat Republicans": 3},
+    ),
+    (
+        "Subject: Enter to meet the Governor\n"
+        "Chip in any amount today and you'll be automatically entered to win a trip to meet the Governor "
+        "backstage at our rally, travel and hotel included.",
+        {"Raffle/Opportunity": 5, "Beat Republicans": 1},
+    ),
+    (
+        "Subject: Another school shooting\n"
+        "Three children were killed this week. Universal background checks and red-flag laws have majority "
+        "support, yet Republican leaders blocked a vote again. Sign the petition for common-sense gun laws.",
+        {"Gun Safety": 5, "Beat Republicans": 2, "Public Education": 1},
+    ),
+    (
+        "Subject: Rural hospitals are closing\n"
+        "Since 2010, more than 140 rural hospitals have closed. Families now drive an hour for emergency care "
+        "and mental health services are out of reach. We're fighting to expand Medicaid and reopen clinics.",
+        {"Healthcare Access": 5, "Rural Investment": 3},
+    ),
+    (
+        "Subject: Rent went up again\n"
+        "Rents in our state rose 14% last year while wages barely moved. Our plan builds 200,000 affordable "
+        "homes and raises the minimum wage to $17 so working families can stay in their communities.",
+        {"Affordable Housing": 5, "Jobs & Wages": 3},
+    ),
+    (
+        "Subject: Trump wants to ignore the courts\n"
+        "Trump's allies are drafting plans to fire thousands of civil servants and defy court rulings. This "
+        "is an unprecedented power grab, and only a Democratic Congress can stop it. Can you chip in $5?",
+        {"Trump Overreach": 5, "Beat Republicans": 3},
+    ),
+    (
+        "Subject: Clean energy jobs are coming home\n"
+        "The new solar plant in our district will create 1,200 union jobs and cut emissions by a million tons "
+        "a year. Republicans voted to repeal the funding that made it possible.",
+        {"Clean Energy": 5, "Jobs & Wages": 3, "Climate Change": 2, "Beat Republicans": 1},
+    ),
+]
+
+
+def system_prompt(kind: str) -> str:
+    return f"You classify campaign {kind}s into issue relevance scores. Only respond in valid JSON. No explanations."
+
+
+def task_text(kind: str) -> str:
+    return (
+        "You are an issue classification assistant for progressive campaigns. Classify the MAIN topics "
+        f"of the {kind} and rate each category from 0 (not relevant) to 5 (highly relevant). Return ONLY valid JSON."
+    )
+
+
+def worked_examples(schema: TagSchema) -> str:
+    """WORKED_EXAMPLES whose categories are all in the schema, as text and expected scores."""
+    shown = [(text, scores) for text, scores in WORKED_EXAMPLES if set(scores) <= set(schema.keys)]
+    if not shown:
+        return ""
+    blocks = [
+        f'Message:\n"""{text}"""\nNon-zero scores: '
+        + ", ".join(f'"{key}": {score}' for key, score in scores.items())
+        for text, scores in shown
+    ]
+    return "WORKED EXAMPLES (every category not listed is 0):\n\n" + "\n\n".join(blocks)
+
+
+def static_prefix(schema: TagSchema, kind: str) -> str:
+    sections = [
+        task_text(kind),
+        f"CATEGORIES:\n{schema.categories_text}",
+        schema.rules(kind),
+        worked_examples(schema),
+        schema.response_shape,
+    ]
+    return "\n\n".join(section for section in sections if section)
+
+
+def static_prefix_tokens(schema: TagSchema, kind: str) -> int:
+    """Rough token count (4 characters per token) of everything the prefix layout sends before the item."""
+    return len(system_prompt(kind) + static_prefix(schema, kind)) // 4
+
+
+def build_prompt(schema: TagSchema, kind: str, section: str, layout: str = DEFAULT_LAYOUT) -> str:
+    """Prompt scoring one item; `section` is the item as the source presents it (e.g. "EMAIL:\\n...")."""
+    if layout == "prefix":
+        return f"{static_prefix(schema, kind)}\n\n{section}"
+    if layout != "inline":
+        raise ValueError(f"Unknown prompt layout {layout!r}; expected one of {PROMPT_LAYOUTS}")
+
+    prompt = f"""
+{task_text(kind)}
+
+CATEGORIES:
+{schema.categories_text}
+
+{section}
+
+{schema.rules(kind)}
+
+{schema.response_shape}
+""".strip()
+    return prompt
+
+
+def build_packed_prompt(schema: TagSchema, kind: str, items: Dict[str, str]) -> str:
+    """One prompt scoring every (id -> text) item; the static instructions come first."""
+    listing = "\n\n".join(f'[{key}]\n"""{text}"""' for key, text in items.items())
+    example_keys = schema.keys[:2]
+    example = ", ".join(f'"{k}": {5 - 4 * n}' for n, k in enumerate(example_keys))
+    return f"""
+You are an issue classification assistant for progressive campaigns. Each {kind} below has an ID in square brackets. Score every {kind} independently, rating each category from 0 (not relevant) to 5 (highly relevant).
+
+CATEGORIES:
+{schema.categories_text}
+
+{schema.rules(kind)}
+
+Return ONE JSON object mapping every {kind} ID to that {kind}'s scores. Leave out categories scored 0, e.g.:
+{{
+  "m0": {{{example}}},
+  "m1": {{}}
+}}
+
+{kind.upper()}S:
+{listing}
+""".strip()
+
+
+def chat_messages(kind: str, prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prompt(kind)},
+        {"role": "user", "content": prompt},
+    ]
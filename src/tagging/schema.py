@@ -0,0 +1,198 @@
+import json
+import re
+from typing import Any, Dict, Literal, Optional, Type
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+MAX_SCORE = 5
+
+# Short category descriptions for the model (no emojis, no "Issue:" prefixes)
+DEFAULT_CATEGORIES: Dict[str, str] = {
+    "Climate Change": "Mitigate and adapt to environmental changes",
+    "Healthcare Access": "Expand affordable care, especially rural and mental health",
+    "Reproductive Rights": "Protect abortion and reproductive care",
+    "Public Education": "Fund schools and improve equity",
+    "Gun Safety": "Enact common-sense reforms",
+    "Voting Rights": "Oppose voter suppression",
+    "Criminal Justice Reform": "End mass incarceration, address police abuse",
+    "Immigration": "Ensure humane, fair immigration policy",
+    "Jobs & Wages": "Raise minimum wage, support unions",
+    "Affordable Housing": "Address rent inflation and homelessness",
+    "Infrastructure": "Invest in roads, transit, water, broadband",
+    "LGBTQ+ Rights": "Protect civil rights and access to care",
+    "Childcare & Paid Leave": "Lower costs and support working families",
+    "Racial Equity": "Close systemic gaps",
+    "Tax Fairness": "Make tax code progressive",
+    "Rural Investment": "Support underserved rural areas",
+    "Clean Energy": "Accelerate renewable transition",
+    "Small Business Support": "Revitalize local economies",
+    "Disability Rights": "Expand access and inclusion",
+    "National Security": "Strengthen democratic alliances",
+    "Trump Overreach": "Federal government going beyond allowed powers",
+    "Beat Republicans": "Support Democrats or oppose GOP candidates",
+    "Raffle/Opportunity": "Sweepstakes, meet-and-greet, or special donor opportunities",
+    "Urgency/End of Quarter": "End-of-period urgency framing",
+}
+
+Score = Literal[0, 1, 2, 3, 4, 5]
+
+_COUNT_WORDS = {1: "ONE", 2: "TWO", 3: "THREE", 4: "FOUR", 5: "FIVE"}
+
+
+class TagSchema:
+    """
+    The categories items are scored on (0-5 each) and the rules a reply must
+    follow: only these keys, integer scores, and at most max_high categories
+    scored 3 or more.
+    """
+
+    def __init__(self, categories: Dict[str, str], max_high: int = 3):
+        if not categories:
+            raise ValueError("A tagging schema needs at least one category")
+        self.categories = dict(categories)
+        self.keys = list(self.categories)
+        self.max_high = max_high
+        self._response_model: Optional[Type[BaseModel]] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "TagSchema":
+        """Load {"categories": {name: description}, "max_high": 3} from a JSON or YAML file."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) if path.endswith((".yaml", ".yml")) else json.load(f)
+        return cls(data["categories"], data.get("max_high", 3))
+
+    @property
+    def response_model(self) -> Type[BaseModel]:
+        """
+        Pydantic model of one reply: every category as a required 0-5 integer,
+        nothing else. Category names are not identifiers, so they are aliases.
+        """
+        if self._response_model is None:
+            fields = {f"c{i}": (Score, Field(alias=key, title=key)) for i, key in enumerate(self.keys)}
+            self._response_model = create_model("IssueScores", __config__=ConfigDict(extra="forbid"), **fields)
+        return self._response_model
+
+    @property
+    def categories_text(self) -> str:
+        return "\n".join(f"{name} — {description}" for name, description in self.categories.items())
+
+    def rules(self, kind: str = "email") -> str:
+        example = ""
+        if {"Voting Rights", "Healthcare Access"} <= set(self.keys):
+            example = (
+                f"\n\nExample: An {kind} mainly about voting in the midterms that briefly mentions healthcare:\n"
+                '"Voting Rights": 5, "Healthcare Access": 1.'
+            )
+        return f"""
+SCORING RULES (strict):
+- Only return the following keys exactly (case and spacing must match): {self.keys}.
+- Do NOT add, remove, rename, or reorder keys. If a category is not relevant, set it to 0.
+- 4–5 ONLY if the main call-to-action, purpose, or argument centers on that category.
+- 1–2 for secondary/background mentions that support the main point but are not the focus.
+- 0 if not mentioned or only indirectly implied.
+- At most {_COUNT_WORDS.get(self.max_high, self.max_high)} categories may be ≥ 3.
+- Use ONLY integers 0–5.
+- Respond with ONLY valid JSON (no markdown fences, no commentary).{example}
+""".strip()
+
+    @property
+    def response_shape(self) -> str:
+        sample = "".join(f'  "{key}": 0,\n' for key in self.keys[:2])
+        return (
+            "Return JSON in this exact shape (keys MUST match the list above), e.g.:\n"
+            f"{{\n{sample}  ...\n}}"
+        )
+
+    def normalize(self, raw_dict: Dict[str, Any]) -> Dict[str, int]:
+        """
+        - Keep only allowed keys.
+        - Coerce values to ints and clamp 0..5.
+        - Enforce at most max_high categories >= 3 (demote extras to 2).
+        """
+        normalized: Dict[str, int] = {k: 0 for k in self.keys}
+        for k, v in list(raw_dict.items()):
+            if k in self.categories:
+                try:
+                    iv = int(v)
+                except Exception:
+                    iv = 0
+                normalized[k] = max(0, min(MAX_SCORE, iv))  # clamp
+
+        high_keys = sorted(
+            [k for k, val in normalized.items() if val >= 3],
+            key=lambda k: normalized[k],
+            reverse=True,
+        )
+        for k in high_keys[self.max_high:]:
+            normalized[k] = 2  # demote incidental to "background"
+        return normalized
+
+    def validate_entry(self, entry: Any) -> Optional[Dict[str, int]]:
+        """
+        Strict check used where a bad entry can be retried: a JSON object with
+        only allowed keys and integer scores 0-5. Returns the normalized
+        scores, or None when the entry is invalid.
+        """
+        if not isinstance(entry, dict):
+            return None
+        for key, value in entry.items():
+            if key not in self.categories or isinstance(value, bool):
+                return None
+            if not isinstance(value, (int, float)) or value != int(value) or not 0 <= value <= MAX_SCORE:
+                return None
+        return self.normalize(entry)
+
+    def scores_from_reply(self, raw: Optional[str]) -> Optional[Dict[str, int]]:
+        """Normalized scores from a model reply, or None if it holds no usable JSON object."""
+        json_text = extract_json(raw or "")
+        if not json_text:
+            print("❌ Could not extract JSON from model output.")
+            return None
+        parsed = json.loads(json_text)
+        if not isinstance(parsed, dict):
+            print("❌ Model output is not a JSON object.")
+            return None
+        return self.normalize(parsed)
+
+
+DEFAULT_SCHEMA = TagSchema(DEFAULT_CATEGORIES)
+
+
+def load_schema(path: Optional[str] = None) -> TagSchema:
+    return TagSchema.from_file(path) if path else DEFAULT_SCHEMA
+
+
+def extract_json(s: str) -> Optional[str]:
+    """
+    Extract JSON object from a string that may contain code fences or extra text.
+    Finds the first '{' and the last '}' and returns that slice if valid.
+    """
+    if not s:
+        return None
+
+    # Strip typical code fences
+    s = s.strip()
+    if s.startswith("```"):
+        s = re.sub(r"^```(?:json)?", "", s, flags=re.IGNORECASE).strip()
+        if s.endswith("```"):
+            s = s[:-3].strip()
+
+    # Try direct parse first
+    try:
+        json.loads(s)
+        return s
+    except Exception:
+        pass
+
+    # Fallback: slice from first '{' to last '}'
+    start = s.find("{")
+    end = s.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        candidate = s[start : end + 1]
+        try:
+            json.loads(candidate)
+            return candidate
+        except Exception:
+            return None
+    return None
@@ -0,0 +1,91 @@
+import hashlib
+import os
+from typing import Any, Callable, Dict, Iterator
+
+from json_stream import iter_emails, iter_json_records
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Every source yields items as dicts with at least:
+#   id    - stable content hash, used to skip already-tagged items on --resume
+#   label - first column of the output CSV (email subject, message text)
+#   text  - plain text used for dedup and the local pre-filter
+Item = Dict[str, Any]
+
+
+def content_key(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ItemSource:
+    """A kind of item to tag: how to load it and how to show one to the model."""
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        label_field: str,
+        default_input: str,
+        default_output: str,
+        load: Callable[[str], Iterator[Item]],
+        section: Callable[[Item], str],
+    ):
+        self.name = name
+        self.kind = kind
+        self.label_field = label_field
+        self.default_input = default_input
+        self.default_output = default_output
+        self.load = load
+        self.section = section
+
+
+def load_emails(path: str) -> Iterator[Item]:
+    for email in iter_emails(path):
+        yield {
+            **email,
+            # Same key as the email tagger's old checkpoints, so --resume keeps working
+            "id": content_key(email["subject"], email["body"]),
+            "label": email["subject"],
+            "text": f"{email['subject']}\n\n{email['body']}",
+        }
+
+
+def email_section(item: Item) -> str:
+    return f"EMAIL:\nSubject: {item.get('subject','')}\n\n{item.get('body','')}"
+
+
+def load_messages(path: str) -> Iterator[Item]:
+    """Messages from a JSON array / JSONL of strings or {"message"|"text"|"body": ...} records, or a .txt file with one per line."""
+    if path.endswith(".txt"):
+        with open(path, "r", encoding="utf-8") as f:
+            records = [line.strip() for line in f if line.strip()]
+    else:
+        records = iter_json_records(path)
+    for record in records:
+        if isinstance(record, dict):
+            record = record.get("message") or record.get("text") or record.get("body") or ""
+        yield message_item(str(record))
+
+
+def message_item(text: str) -> Item:
+    return {"id": content_key(text), "label": text, "text": text}
+
+
+def message_section(item: Item) -> str:
+    return f'MESSAGE:\n"""{item["text"]}"""'
+
+
+SOURCES: Dict[str, ItemSource] = {
+    "emails": ItemSource(
+        "emails", "email", "Subject",
+        os.path.join(SRC_DIR, "all_emails_full.json"),
+        os.path.join(SRC_DIR, "tagged_emails2.csv"),
+        load_emails, email_section,
+    ),
+    "sms": ItemSource(
+        "sms", "message", "Message",
+        os.path.join(SRC_DIR, "sms_messages.json"),
+        os.path.join(SRC_DIR, "tagged_messages.csv"),
+        load_messages, message_section,
+    ),
+}
@@ -0,0 +1,53 @@
+import threading
+from typing import Any, Dict
+
+
+class TokenUsage:
+    """
+    Thread-safe running totals of the `usage` block on chat completion
+    responses, including how many prompt tokens the provider served from its
+    prompt cache (usage.prompt_tokens_details.cached_tokens).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.prompt_tokens = 0
+            self.cached_tokens = 0
+            self.completion_tokens = 0
+
+    def record(self, usage: Any) -> None:
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.cached_tokens += cached
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens that were served from the provider's prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cache_hit_rate": self.cache_hit_rate,
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.prompt_tokens} prompt tokens "
+            f"({self.cached_tokens} cached, {self.cache_hit_rate:.1%}), "
+            f"{self.completion_tokens} completion tokens"
+        )
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make src/ importable, the same way the scripts do
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
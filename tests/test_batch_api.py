@@ -0,0 +1,132 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+import batch_api
+
+
+class StubBatchServer(BaseHTTPRequestHandler):
+    """
+    Just enough of the Files and Batches endpoints for batch_api: uploads are
+    kept in memory, each batch reports in_progress once before completing,
+    and a request whose custom_id starts with "bad" fails.
+    """
+
+    files = {}
+    batches = {}
+    polls = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _add_file(self, content, purpose):
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = content
+        return {"id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+                "filename": f"{file_id}.jsonl", "purpose": purpose, "status": "processed"}
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/v1/files":
+            # The JSONL input is the only part of the multipart body that holds request lines
+            lines = re.findall(rb'^\{"custom_id".*$', body, flags=re.M)
+            return self._send(self._add_file(b"\n".join(lines).decode(), "batch"))
+        if self.path == "/v1/batches":
+            params = json.loads(body)
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": params["endpoint"],
+                "input_file_id": params["input_file_id"], "completion_window": params["completion_window"],
+                "created_at": 0, "status": "validating",
+            }
+            return self._send(self.batches[batch_id])
+        self.send_error(404)
+
+    def do_GET(self):
+        match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+        if match:
+            return self._send(self._poll(match.group(1)))
+        match = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+        if match:
+            return self._send(self.files[match.group(1)].encode(), "application/jsonl")
+        self.send_error(404)
+
+    def _poll(self, batch_id):
+        batch = self.batches[batch_id]
+        requests = [json.loads(line) for line in self.files[batch["input_file_id"]].splitlines()]
+        self.polls[batch_id] = self.polls.get(batch_id, 0) + 1
+        if self.polls[batch_id] == 1:
+            return {**batch, "status": "in_progress",
+                    "request_counts": {"total": len(requests), "completed": 0, "failed": 0}}
+
+        output, errors = [], []
+        for request in requests:
+            assert request["url"] == batch_api.ENDPOINT and request["body"]["model"] == "stub-model"
+            if request["custom_id"].startswith("bad"):
+                errors.append({"custom_id": request["custom_id"],
+                               "response": {"status_code": 400, "body": {"error": {"message": "bad"}}}})
+            else:
+                content = request["body"]["messages"][-1]["content"].upper()
+                output.append({"custom_id": request["custom_id"], "response": {
+                    "status_code": 200, "body": {"choices": [{"message": {"role": "assistant", "content": content}}]},
+                }})
+        jsonl = lambda records: "\n".join(json.dumps(r) for r in records)
+        return {
+            **batch, "status": "completed",
+            "output_file_id": self._add_file(jsonl(output), "batch_output")["id"],
+            "error_file_id": self._add_file(jsonl(errors), "batch_output")["id"] if errors else None,
+            "request_counts": {"total": len(requests), "completed": len(output), "failed": len(errors)},
+        }
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    StubBatchServer.files, StubBatchServer.batches, StubBatchServer.polls = {}, {}, {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubBatchServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    try:
+        yield OpenAI(api_key="test")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_run_batches_round_trip_through_a_stub_server(stub_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_api, "MAX_REQUESTS_PER_BATCH", 2)
+    requests = [(f"m{i}", [{"role": "user", "content": f"email {i}"}]) for i in range(3)]
+    requests.append(("bad-0", [{"role": "user", "content": "broken"}]))
+
+    replies = batch_api.run_batches(stub_client, requests, "stub-model", str(tmp_path), poll_interval=0)
+
+    assert replies == {"m0": "EMAIL 0", "m1": "EMAIL 1", "m2": "EMAIL 2", "bad-0": None}
+    # Four requests at two per input file: two uploads, two batches, each polled until it completed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["batch_input_0000.jsonl", "batch_input_0001.jsonl"]
+    assert StubBatchServer.polls == {"batch-0": 2, "batch-1": 2}
+
+
+def test_write_batch_file_lines(tmp_path):
+    path = tmp_path / "in.jsonl"
+    count = batch_api.write_batch_file(
+        [("a", [{"role": "user", "content": "é"}])], str(path), "stub-model",
+        response_format={"type": "json_object"},
+    )
+    assert count == 1
+    line = json.loads(path.read_text(encoding="utf-8"))
+    assert line == {
+        "custom_id": "a", "method": "POST", "url": batch_api.ENDPOINT,
+        "body": {"model": "stub-model", "messages": [{"role": "user", "content": "é"}], "temperature": 0,
+                 "response_format": {"type": "json_object"}},
+    }
@@ -0,0 +1,63 @@
+import numpy as np
+
+from donor_events import DonorEventStore
+from donor_scoring import ACTION_CODES, CTA_CODES
+from donor_state import DAYS_PER_WEEK, DonorScoreState
+
+START_DAY = 739_000  # any ordinal; only its residue mod 7 matters
+
+
+def _random_events(rng, n, n_donors, first_day, last_day):
+    return (
+        rng.integers(0, n_donors, n),
+        rng.integers(first_day, last_day + 1, n),
+        rng.integers(0, len(ACTION_CODES), n),
+        rng.integers(0, len(CTA_CODES), n),
+    )
+
+
+def test_roll_forward_matches_full_recompute(tmp_path):
+    rng = np.random.default_rng(3)
+    state = DonorScoreState(START_DAY, store=DonorEventStore(str(tmp_path / "events")))
+    # A year of history before the state starts rolling
+    state.ingest(*_random_events(rng, 5_000, 200, START_DAY - 365, START_DAY))
+    assert np.allclose(state.scores, state.full_recompute())
+
+    day = START_DAY
+    # Single days wrap through every residue mod 7; the longer jumps cross several weeks at once
+    for step in [1] * 2 * DAYS_PER_WEEK + [3, 6, 7, 8, 13, 30]:
+        day += step
+        state.roll_forward(day)
+        assert np.allclose(state.scores, state.full_recompute()), day
+
+        # New events for today, a few late arrivals, and donors the state has not seen yet
+        n_donors = len(state.partials) + int(rng.integers(0, 5))
+        state.ingest(*_random_events(rng, int(rng.integers(0, 60)), n_donors, day - 10, day))
+        assert np.allclose(state.scores, state.full_recompute()), day
+
+
+def test_roll_forward_within_a_week_only_decays_crossed_residues():
+    state = DonorScoreState(START_DAY)
+    days = START_DAY - np.arange(DAYS_PER_WEEK)
+    state.add_events(np.zeros(DAYS_PER_WEEK, dtype=int), days,
+                     np.full(DAYS_PER_WEEK, ACTION_CODES["donated"]), np.full(DAYS_PER_WEEK, CTA_CODES["donation"]))
+    before = state.partials.copy()
+    state.roll_forward(START_DAY + 1)
+    decayed = np.flatnonzero(~np.isclose(state.partials[0], before[0]))
+    # Exactly one residue's events cross a week boundary per day
+    assert len(decayed) == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(5)
+    store = DonorEventStore(str(tmp_path / "events"))
+    state = DonorScoreState(START_DAY, store=store)
+    state.ingest(*_random_events(rng, 500, 30, START_DAY - 60, START_DAY))
+    state.save(str(tmp_path / "state.npz"))
+
+    loaded = DonorScoreState.load(str(tmp_path / "state.npz"), store=store)
+    loaded.roll_forward(START_DAY + 9)
+    state.roll_forward(START_DAY + 9)
+    assert loaded.as_of_day == state.as_of_day
+    assert np.allclose(loaded.scores, state.scores)
+    assert np.allclose(loaded.scores, loaded.full_recompute())
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import email_index
+from email_index import EmbeddingCache
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(sum(map(ord, text)) % 97), 1.0])
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=data[::-1])  # the API does not promise input order
+
+
+def _cache(path, embeddings):
+    return EmbeddingCache(str(path), api_client=SimpleNamespace(embeddings=embeddings))
+
+
+def test_new_texts_are_appended_per_batch_and_reloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(email_index, "EMBEDDING_BATCH", 2)
+    fake = FakeEmbeddings()
+    texts = [f"email {i}" * (i + 1) for i in range(5)]
+    vectors = _cache(tmp_path, fake).embed(texts)
+    assert [len(batch) for batch in fake.requests] == [2, 2, 1]
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1)
+
+    reloaded = FakeEmbeddings()
+    cache = _cache(tmp_path, reloaded)
+    assert np.allclose(cache.embed(texts[::-1]), vectors[::-1])
+    assert reloaded.requests == []
+
+
+def test_queries_are_not_persisted(tmp_path):
+    cache = _cache(tmp_path, FakeEmbeddings())
+    stored = cache.embed(["past email"])
+    keys_size = (tmp_path / "keys.bin").stat().st_size
+
+    query = cache.embed(["today's article", "past email"], persist=False)
+    assert np.allclose(query[1], stored[0])
+    assert (tmp_path / "keys.bin").stat().st_size == keys_size
+    assert len(_cache(tmp_path, FakeEmbeddings())._rows) == 1
+
+
+def test_partial_append_is_ignored(tmp_path):
+    cache = _cache(tmp_path, FakeEmbeddings())
+    vectors = cache.embed(["a", "bb"])
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(b"\0" * 7)  # interrupted append
+
+    fake = FakeEmbeddings()
+    recovered = _cache(tmp_path, fake)
+    assert np.allclose(recovered.embed(["a", "bb", "ccc"])[:2], vectors)
+    assert fake.requests == [["ccc"]]
+    assert len(_cache(tmp_path, FakeEmbeddings())._rows) == 3
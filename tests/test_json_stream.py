@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from json_stream import iter_emails, iter_json_records
+
+MIXED = [
+    123, 4.5, 1500.0, -0.25, 1e3, 2.5E-7, -12e+2, 0, True, False, None,
+    "plain", 'esc " quote \\ é \n', [1.5, [2e2, {}]], {"subject": "Hi, [there]", "n": 10.75},
+    {"body": "x" * 40, "nested": {"a": [1, 2.0, -3e-1]}}, 7,
+]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_every_chunk_size_decodes_the_same_values(tmp_path, indent):
+    path = tmp_path / "mixed.json"
+    text = json.dumps(MIXED, indent=indent)
+    path.write_text(text, encoding="utf-8")
+    for chunk_size in range(1, len(text) + 2):
+        assert list(iter_json_records(str(path), chunk_size)) == MIXED, chunk_size
+
+
+@pytest.mark.parametrize("text", ["[123, 4.5]", "[1500.0, 2]", "[1e5]", "[-7]", "[ 3 , 4 ]"])
+def test_numbers_cut_at_chunk_edges(tmp_path, text):
+    path = tmp_path / "numbers.json"
+    path.write_text(text, encoding="utf-8")
+    for chunk_size in range(1, len(text) + 2):
+        assert list(iter_json_records(str(path), chunk_size)) == json.loads(text), chunk_size
+
+
+def test_malformed_and_unterminated_arrays_raise(tmp_path):
+    for text in ["[1, 2", "[1.5x]", '[{"a": 1}, {"b"']:
+        path = tmp_path / "bad.json"
+        path.write_text(text, encoding="utf-8")
+        for chunk_size in (1, 3, 64):
+            with pytest.raises(ValueError):
+                list(iter_json_records(str(path), chunk_size))
+
+
+def test_jsonl_emails(tmp_path):
+    path = tmp_path / "emails.jsonl"
+    path.write_text('{"subject": "A", "body": "one"}\n\n{"subject": "B"}\n', encoding="utf-8")
+    assert list(iter_emails(str(path))) == [{"subject": "A", "body": "one"}, {"subject": "B", "body": ""}]
@@ -0,0 +1,144 @@
+"""
+Differential tests: KeywordMatcher's single compiled pass must agree with a
+plain per-keyword loop on a fixed corpus.
+"""
+import random
+import re
+
+from issue_selector import (
+    CATEGORICAL_ISSUES,
+    ISSUE_GROUP_PREFIX,
+    KEYWORD_GROUPS,
+    KEYWORD_MATCHER,
+    _pluralizable,
+    get_issue_label,
+)
+from keyword_matcher import KeywordMatcher, plural
+
+ALL_KEYWORDS = sorted({kw for kws in KEYWORD_GROUPS.values() for kw in kws})
+# Words that contain or resemble keywords without being them
+NEAR_MISSES = [
+    "does", "wares", "said", "under", "trumps", "gasoline", "jobless", "heated", "chinatown",
+    "policies", "countries", "americans", "schools", "nationals", "unemployed", "aid", "tariff",
+]
+FILLER = ["the", "a", "of", "and", "in", "on", "reported", "today", "officials", "new", "plan", "local"]
+
+HANDWRITTEN = [
+    "trump administration officials said the federal budget will cut medicaid",
+    "what does he want from the wares on sale?",
+    "new trade policies hit two countries as tariffs rise",
+    "the un envoy said nothing under pressure",
+    "wildfire and hurricane season: climate bill stalls in congress",
+    "more jobs, fewer wars, and cheaper gas prices nationwide",
+    "guns and shootings: a gun reform bill passes the senate",
+    "students and colleges brace for student loan forgiveness ruling",
+    "",
+    "trump\n  administration   and the white\thouse",
+]
+
+
+def _corpus(size=300, seed=7):
+    rng = random.Random(seed)
+    vocabulary = ALL_KEYWORDS + [plural(kw) for kw in ALL_KEYWORDS] + NEAR_MISSES + FILLER
+    texts = list(HANDWRITTEN)
+    for _ in range(size):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(3, 25))]
+        texts.append("".join(w + rng.choice([" ", "  ", "\n", ", ", ". "]) for w in words).strip())
+    return texts
+
+
+CORPUS = _corpus()
+
+
+# ---------------------------
+# Substring mode vs the original any(keyword in text) loops
+# ---------------------------
+def _old_issue_label(text):
+    for issue, keywords in CATEGORICAL_ISSUES.items():
+        if any(keyword in text for keyword in keywords):
+            return issue
+    return None
+
+
+def test_substring_mode_matches_per_keyword_loop():
+    matcher = KeywordMatcher(KEYWORD_GROUPS)
+    for text in CORPUS:
+        expected = {name for name, kws in KEYWORD_GROUPS.items() if any(kw in text for kw in kws)}
+        assert set(matcher.match_groups(text)) == expected, text
+        assert matcher.find_keywords(text) == {kw for kw in ALL_KEYWORDS if kw in text}, text
+
+        hits = matcher.match_groups(text)
+        label = next((issue for issue in CATEGORICAL_ISSUES if ISSUE_GROUP_PREFIX + issue in hits), None)
+        assert label == _old_issue_label(text), text
+
+
+# ---------------------------
+# Whole-word mode vs one regex per keyword
+# ---------------------------
+def _reference_matches(text):
+    matches = set()
+    for kw in ALL_KEYWORDS:
+        forms = [kw, plural(kw)] if _pluralizable(kw) else [kw]
+        for form in forms:
+            words = r"\s+".join(re.escape(token) for token in form.split())
+            for m in re.finditer(rf"(?<!\w)(?=({words})(?!\w))", text):
+                matches.add((m.start(), m.start() + len(m.group(1)), kw))
+    return matches
+
+
+def _reference_label(text):
+    counts = {}
+    for start, end, kw in _reference_matches(text):
+        for issue, keywords in CATEGORICAL_ISSUES.items():
+            if kw in keywords:
+                counts[issue] = counts.get(issue, 0) + 1
+    if not counts:
+        return None
+    # Most hits wins; ties go to the issue listed first
+    return max(CATEGORICAL_ISSUES, key=lambda issue: counts.get(issue, 0))
+
+
+def test_whole_word_mode_matches_per_keyword_regexes():
+    for text in CORPUS:
+        found = KEYWORD_MATCHER.find_matches(text)
+        assert len(found) == len(set(found)), text
+        assert set(found) == _reference_matches(text), text
+        assert [start for start, _, _ in found] == sorted(start for start, _, _ in found)
+
+
+def test_issue_labels_match_reference():
+    for text in CORPUS:
+        assert get_issue_label({"title": text}) == _reference_label(text), text
+
+
+# ---------------------------
+# Overlapping keywords on a tiny alphabet, so matches nest and chain often
+# ---------------------------
+OVERLAPPING = {
+    "x": ["ab", "bc", "abc d", "c d e", "d", "a-b", "b-c d"],
+    "y": ["bcb", "cb", "e a", "dd"],
+}
+
+
+def _overlap_reference(text, whole_words):
+    matches = set()
+    for kw in {kw for kws in OVERLAPPING.values() for kw in kws}:
+        if whole_words:
+            pattern = r"(?<!\w)(?=(" + r"\s+".join(re.escape(t) for t in kw.split()) + r")(?!\w))"
+        else:
+            pattern = "(?=(" + re.escape(kw) + "))"
+        for m in re.finditer(pattern, text):
+            matches.add((m.start(), m.start() + len(m.group(1)), kw))
+    return matches
+
+
+def test_overlapping_keywords_match_reference():
+    rng = random.Random(11)
+    for whole_words in (False, True):
+        matcher = KeywordMatcher(OVERLAPPING, whole_words=whole_words)
+        for _ in range(2000):
+            text = "".join(rng.choice("abcde  -\n") for _ in range(rng.randint(0, 30)))
+            found = matcher.find_matches(text)
+            assert len(found) == len(set(found)), text
+            assert set(found) == _overlap_reference(text, whole_words), (whole_words, text)
+            assert [start for start, _, _ in found] == sorted(start for start, _, _ in found)
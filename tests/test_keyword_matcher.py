@@ -0,0 +1,33 @@
+from issue_selector import KEYWORD_MATCHER, get_issue_label
+from keyword_matcher import KeywordMatcher, plural
+
+
+def test_plural_forms():
+    assert plural("policy") == "policies"
+    assert plural("country") == "countries"
+    assert plural("day") == "days"
+    assert plural("tax") == "taxes"
+    assert plural("student") == "students"
+
+
+def test_short_keywords_and_acronyms_do_not_take_plurals():
+    assert KEYWORD_MATCHER.find_matches("what does he want") == []
+    assert KEYWORD_MATCHER.find_matches("wares for sale") == []
+    assert KEYWORD_MATCHER.find_matches("he trumps his rivals") == []
+
+
+def test_plural_keywords_match_ies_plurals():
+    assert KEYWORD_MATCHER.find_matches("new trade policies") == [(4, 18, "trade policy")]
+    assert KEYWORD_MATCHER.find_matches("two countries") == [(4, 13, "country")]
+    assert KEYWORD_MATCHER.find_keywords("students and colleges") == {"student", "college"}
+
+
+def test_explicit_short_plurals():
+    assert KEYWORD_MATCHER.find_keywords("more jobs, fewer wars") == {"jobs", "wars"}
+    assert get_issue_label({"title": "guns and shootings"}) == "gun safety"
+
+
+def test_plurals_are_opt_in():
+    matcher = KeywordMatcher({"g": ["policy", "war"]}, whole_words=True, plural_keywords=["policy"])
+    assert matcher.find_keywords("policies and wars") == {"policy"}
+    assert matcher.find_keywords("a policy at war") == {"policy", "war"}
@@ -0,0 +1,69 @@
+"""
+PartialJsonStrings fed a reply in pieces must agree with decoding each
+received prefix from scratch, the way the live view used to on every delta.
+"""
+import io
+import json
+
+import pytest
+
+from live_render import _FIELD_START, LiveSections, PartialJsonStrings, _read_partial_string, partial_json_strings
+
+REPLY = "```json\n" + json.dumps({
+    "issue": "Healthcare \"access\" \\ costs",
+    "count": 3,
+    "tags": ["a", "b"],
+    "local_stat": "Ohio: 12% uninsured\tup 2 pts é ✓",
+    "issue_dup": "x",
+    "email": "Dear friend,\n\nThe clinic on é Main St closed.\n— Team 😀",
+}, indent=1, ensure_ascii=False) + "\n```"
+ESCAPED_REPLY = REPLY.replace("é", "\\u00e9").replace("😀", "\\ud83d\\ude00")
+
+
+def _reference(text):
+    fields, pos = {}, 0
+    while True:
+        match = _FIELD_START.search(text, pos)
+        if not match:
+            return fields
+        value, pos = _read_partial_string(text, match.end())
+        fields.setdefault(match.group(1), value)
+
+
+@pytest.mark.parametrize("reply", [REPLY, ESCAPED_REPLY])
+@pytest.mark.parametrize("size", range(1, 12))
+def test_every_prefix_matches_a_full_decode(reply, size):
+    parser = PartialJsonStrings()
+    for end in range(size, len(reply) + size, size):
+        parser.feed(reply[end - size:end])
+        assert parser.fields == _reference(reply[:end])
+
+
+def test_complete_reply():
+    fields = partial_json_strings(REPLY)
+    expected = json.loads(REPLY.strip("`").removeprefix("json"))
+    assert list(fields) == ["issue", "local_stat", "issue_dup", "email"]
+    assert fields == {k: expected[k] for k in fields}
+    assert partial_json_strings(ESCAPED_REPLY) == fields
+
+
+def test_only_unconsumed_text_is_kept():
+    parser = PartialJsonStrings()
+    parser.feed('{"email": "' + "word " * 2000)
+    parser.feed("tail\\")  # escape split across deltas
+    assert parser._tail == "\\"
+    parser.feed('n", "next')
+    assert parser._tail == '"next'
+    assert parser.fields["email"].endswith("tail\n")
+
+
+def test_live_sections_redraw_only_when_due():
+    stream = io.StringIO()
+    live = LiveSections(["one"], stream=stream, min_interval=3600)
+    assert live.due()
+    live.update(0, "first")
+    assert not live.due()
+    live.update(0, "second")
+    assert "second" not in stream.getvalue()
+    live.update(0, "third", done=True)
+    assert "third" in stream.getvalue()
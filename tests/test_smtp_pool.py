@@ -0,0 +1,140 @@
+import smtplib
+import threading
+from email import message_from_string
+from email.header import decode_header, make_header
+from email.utils import getaddresses
+
+import pytest
+
+import smtp_pool
+from smtp_pool import BulkSender, OutgoingEmail, SMTPSettings, is_permanent, read_recipients
+
+
+class FakeSMTP:
+    """Stand-in for smtplib.SMTP; `failures` maps a recipient to errors raised on its next sends."""
+
+    sessions = []
+    failures = {}
+    login_error = None
+    lock = threading.Lock()
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        with self.lock:
+            self.sessions.append(self)
+
+    def starttls(self, context=None):
+        pass
+
+    def login(self, user, password):
+        if self.login_error:
+            raise self.login_error
+
+    def sendmail(self, sender, recipients, body):
+        assert not self.closed
+        with self.lock:
+            pending = self.failures.get(recipients[0])
+            error = pending.pop(0) if pending else None
+        if error:
+            raise error
+        self.sent.append((recipients[0], body))
+
+    def quit(self):
+        self.closed = True
+
+    close = quit
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.sessions, FakeSMTP.failures, FakeSMTP.login_error = [], {}, None
+    monkeypatch.setattr(smtp_pool.smtplib, "SMTP", FakeSMTP)
+    sleeps = []
+    monkeypatch.setattr(smtp_pool.time, "sleep", sleeps.append)
+    monkeypatch.setattr(smtp_pool.random, "random", lambda: 0.5)  # no jitter
+    return sleeps
+
+
+def _emails(n):
+    return [OutgoingEmail(f"user{i}@example.com", "Subject", "Body") for i in range(n)]
+
+
+def _settings():
+    return SMTPSettings("smtp.test", sender="campaign@example.com", user="user", password="pw")
+
+
+def test_sessions_are_reused_and_recycled_after_max_messages(fake_smtp):
+    report = BulkSender(_settings(), connections=1).send_all(_emails(250))
+    assert report.sent == 250 and not report.failed
+    assert [len(s.sent) for s in FakeSMTP.sessions] == [100, 100, 50]
+    assert report.connections == 3
+    assert all(s.closed for s in FakeSMTP.sessions)
+
+
+def test_parallel_sends_share_a_bounded_pool(fake_smtp):
+    report = BulkSender(_settings(), connections=4).send_all(_emails(120))
+    assert report.sent == 120
+    assert sum(len(s.sent) for s in FakeSMTP.sessions) == 120
+    assert all(len(s.sent) <= smtp_pool.MAX_MESSAGES_PER_CONNECTION for s in FakeSMTP.sessions)
+    assert report.connections <= 4 + 120 // smtp_pool.MAX_MESSAGES_PER_CONNECTION
+
+
+def test_transient_errors_retry_with_exponential_backoff(fake_smtp):
+    FakeSMTP.failures["user0@example.com"] = [smtplib.SMTPServerDisconnected("gone"),
+                                             smtplib.SMTPResponseException(421, b"try later")]
+    report = BulkSender(_settings(), connections=1, backoff=1.0).send_all(_emails(1))
+    assert report.sent == 1 and report.retries == 2
+    assert fake_smtp == [1.0, 2.0]
+    # Neither a dropped connection nor a 421 "closing channel" reply leaves a usable session
+    assert len(FakeSMTP.sessions) == 3 and len(FakeSMTP.sessions[-1].sent) == 1
+
+
+def test_gives_up_after_max_retries(fake_smtp):
+    FakeSMTP.failures["user0@example.com"] = [smtplib.SMTPServerDisconnected("gone")] * 10
+    report = BulkSender(_settings(), connections=1, max_retries=3, backoff=0.5).send_all(_emails(1))
+    assert report.sent == 0 and report.retries == 3
+    assert fake_smtp == [0.5, 1.0, 2.0]
+    assert [r for r, _ in report.failed] == ["user0@example.com"]
+
+
+@pytest.mark.parametrize("error", [
+    smtplib.SMTPRecipientsRefused({"user0@example.com": (550, b"no such user")}),
+    smtplib.SMTPDataError(554, b"rejected"),
+    smtplib.SMTPSenderRefused(553, b"bad sender", "campaign@example.com"),
+])
+def test_permanent_rejections_fail_fast(fake_smtp, error):
+    FakeSMTP.failures["user0@example.com"] = [error]
+    report = BulkSender(_settings(), connections=1).send_all(_emails(3))
+    assert report.retries == 0 and fake_smtp == []
+    assert [r for r, _ in report.failed] == ["user0@example.com"]
+    assert report.sent == 2 and len(FakeSMTP.sessions) == 1  # the session survives a refusal
+
+
+def test_permanent_login_failure_stops_the_whole_send(fake_smtp):
+    FakeSMTP.login_error = smtplib.SMTPAuthenticationError(535, b"bad credentials")
+    report = BulkSender(_settings(), connections=2).send_all(_emails(50))
+    assert report.sent == 0 and report.retries == 0 and fake_smtp == []
+    assert len(report.failed) == 50
+    assert len(FakeSMTP.sessions) <= 2
+
+
+def test_is_permanent():
+    assert is_permanent(smtplib.SMTPResponseException(550, b"no"))
+    assert is_permanent(smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server."))
+    assert not is_permanent(smtplib.SMTPResponseException(451, b"later"))
+    assert not is_permanent(smtplib.SMTPRecipientsRefused({"a": (550, b"no"), "b": (452, b"full")}))
+    assert not is_permanent(OSError("connection reset"))
+
+
+def test_display_name_and_recipients_csv(tmp_path):
+    path = tmp_path / "recipients.csv"
+    path.write_text("Email, Location ,Name\na@example.com,Ohio,Ana Díaz\n,Texas,No Address\nb@example.com,,\n",
+                    encoding="utf-8")
+    rows = read_recipients(str(path))
+    assert rows == [{"email": "a@example.com", "location": "Ohio", "name": "Ana Díaz"},
+                    {"email": "b@example.com", "location": "", "name": ""}]
+
+    named = message_from_string(OutgoingEmail("a@example.com", "S", "T", name="Ana Díaz").as_mime("c@example.com"))
+    assert getaddresses([str(make_header(decode_header(named["To"])))]) == [("Ana Díaz", "a@example.com")]
+    assert message_from_string(OutgoingEmail("b@example.com", "S", "T").as_mime("c@example.com"))["To"] == "b@example.com"
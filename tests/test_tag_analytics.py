@@ -0,0 +1,42 @@
+import csv
+
+import numpy as np
+
+from tag_analytics import _read_header, load_scores, shard_ranges, summarize_csv
+
+
+def _write_csv(path, rows=400):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Subject", "Climate", "Jobs", "Guns"])
+        for i in range(rows):
+            subject = f"Line one\nline \"two\", {i}" if i % 3 == 0 else f"Subject {i}"
+            scores = [str((i * k) % 6) for k in (1, 2, 5)]
+            if i % 50 == 7:
+                scores[1] = ""  # blank cell scores 0
+            writer.writerow([subject] + scores)
+
+
+def test_shards_start_on_row_boundaries(tmp_path):
+    path = tmp_path / "tagged.csv"
+    _write_csv(path)
+    _, start = _read_header(path)
+    ranges = shard_ranges(str(path), start, shard_bytes=512)
+    assert len(ranges) > 5
+    data = path.read_bytes()
+    parsed = [row for begin, end in ranges for row in csv.reader(data[begin:end].decode().splitlines(keepends=True))]
+    assert len(parsed) == 400
+
+
+def test_sharded_summary_matches_whole_file(tmp_path):
+    path = tmp_path / "tagged.csv"
+    _write_csv(path)
+    whole = summarize_csv(str(path), workers=1, shard_bytes=1 << 30)
+    sharded = summarize_csv(str(path), workers=2, shard_bytes=512)
+    assert whole["rows"] == sharded["rows"] == 400
+    assert np.array_equal(whole["distribution"], sharded["distribution"])
+    assert np.array_equal(whole["cooccurrence"], sharded["cooccurrence"])
+    assert whole["top"] == sharded["top"]
+
+    _, _, matrix = load_scores(str(path))
+    assert np.array_equal(whole["distribution"].sum(axis=1), [len(matrix)] * 3)
@@ -0,0 +1,87 @@
+import csv
+import json
+
+import pytest
+
+from local_classifier import Prefilter
+from tag_analytics import LLM_ORIGIN, LOCAL_ORIGIN, ORIGIN_COLUMN, load_scores, summarize_csv
+from tagging import cli
+from tagging.engine import Tagger
+from tagging.schema import DEFAULT_SCHEMA
+from tagging.sources import SOURCES, message_item
+
+ITEM = message_item("Chip in $5 to protect Medicaid")
+REPLY = json.dumps({category: 1 for category in DEFAULT_SCHEMA.categories})
+
+
+@pytest.mark.parametrize("verbose", [False, True])
+def test_raw_replies_are_printed_only_when_verbose(capsys, monkeypatch, verbose):
+    tagger = Tagger(source=SOURCES["sms"], structured=False, verbose=verbose)
+    monkeypatch.setattr(tagger, "complete", lambda messages, response_format=None: REPLY)
+    assert tagger.tag(ITEM) == {category: 1 for category in DEFAULT_SCHEMA.categories}
+    assert ("Raw reply" in capsys.readouterr().out) == verbose
+
+
+class FakeLocalModel:
+    """Confident only about texts mentioning "local"."""
+
+    def predict(self, text):
+        return {DEFAULT_SCHEMA.keys[0]: 2}, 0.99 if "local" in text else 0.1
+
+
+def _llm_reply(self, messages, reply_tokens=None, response_format=None):
+    return REPLY
+
+
+@pytest.mark.parametrize("mode", ["sync", "packed"])
+def test_prefilter_answers_are_marked_local_including_duplicates(monkeypatch, mode):
+    monkeypatch.setattr(Tagger, "complete", _llm_reply)
+    tagger = Tagger(source=SOURCES["sms"], structured=False, prefilter=Prefilter(FakeLocalModel()))
+    # The last text is a duplicate of the first that the model alone would not be sure about
+    texts = ["a local story about clinics", "an LLM story", "A LOCAL story about clinics."]
+    tagged = list(tagger.run([message_item(t) for t in texts], mode=mode, dedup=True))
+    assert [item.get(ORIGIN_COLUMN) for item, _ in tagged] == [LOCAL_ORIGIN, None, LOCAL_ORIGIN]
+    assert tagged[0][1] == tagged[2][1] != tagged[1][1]
+
+
+def test_cli_output_keeps_local_labels_out_of_training_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(Tagger, "complete", _llm_reply)
+    monkeypatch.setattr(cli.LocalClassifier, "load", staticmethod(lambda path: FakeLocalModel()))
+    messages, output = tmp_path / "messages.txt", tmp_path / "tagged.csv"
+    messages.write_text("local one\nfrom the LLM\nlocal two\n", encoding="utf-8")
+    argv = ["--source", "sms", "--input", str(messages), "--output", str(output),
+            "--prefilter-model", "model.npz", "--no-structured", "--workers", "1"]
+    cli.main(argv)
+
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["Message"], r[ORIGIN_COLUMN]) for r in rows] == [
+        ("local one", LOCAL_ORIGIN), ("from the LLM", LLM_ORIGIN), ("local two", LOCAL_ORIGIN)]
+    checkpoint = (tmp_path / "tagged.csv.checkpoint").read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t")[1] for line in checkpoint] == [LOCAL_ORIGIN, LLM_ORIGIN, LOCAL_ORIGIN]
+    assert len(cli.load_checkpoint(str(tmp_path / "tagged.csv.checkpoint"))) == 3
+
+    subjects, categories, matrix = load_scores(str(output), llm_only=True)
+    assert subjects == ["from the LLM"] and categories == DEFAULT_SCHEMA.keys
+    assert matrix.tolist() == [[1] * len(categories)]
+    assert summarize_csv(str(output), workers=1)["categories"] == DEFAULT_SCHEMA.keys
+
+
+def test_resuming_an_output_without_the_origin_column(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(Tagger, "complete", _llm_reply)
+    monkeypatch.setattr(cli.LocalClassifier, "load", staticmethod(lambda path: FakeLocalModel()))
+    messages, output = tmp_path / "messages.txt", tmp_path / "tagged.csv"
+    messages.write_text("old\nnew\n", encoding="utf-8")
+    old_header = ["Message"] + DEFAULT_SCHEMA.keys
+    output.write_text(",".join(old_header) + "\nold," + ",".join("0" * len(DEFAULT_SCHEMA.keys)) + "\n",
+                      encoding="utf-8")
+    (tmp_path / "tagged.csv.checkpoint").write_text(message_item("old")["id"] + "\n", encoding="utf-8")
+    argv = ["--source", "sms", "--input", str(messages), "--output", str(output), "--resume", "--no-structured"]
+
+    cli.main(argv + ["--prefilter-model", "model.npz"])
+    assert "no label_origin column" in capsys.readouterr().out
+    cli.main(argv)
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == old_header and [r[0] for r in rows[1:]] == ["old", "new"]
+    assert all(len(r) == len(old_header) for r in rows)
@@ -0,0 +1,26 @@
+from tagging.prompts import (
+    MIN_CACHEABLE_TOKENS,
+    build_prompt,
+    static_prefix,
+    static_prefix_tokens,
+    worked_examples,
+)
+from tagging.schema import DEFAULT_SCHEMA, TagSchema
+
+
+def test_default_prefix_is_long_enough_to_cache():
+    for kind in ("email", "message"):
+        assert static_prefix_tokens(DEFAULT_SCHEMA, kind) >= MIN_CACHEABLE_TOKENS
+
+
+def test_prefix_layout_ends_with_the_item_and_inline_has_no_examples():
+    section = 'EMAIL:\n"""Vote on Tuesday"""'
+    prefix = build_prompt(DEFAULT_SCHEMA, "email", section, layout="prefix")
+    assert prefix == f"{static_prefix(DEFAULT_SCHEMA, 'email')}\n\n{section}"
+    assert "WORKED EXAMPLES" not in build_prompt(DEFAULT_SCHEMA, "email", section, layout="inline")
+
+
+def test_examples_only_use_schema_categories():
+    assert worked_examples(TagSchema({"Voting Rights": "x"})) == ""
+    small = TagSchema({"Voting Rights": "x", "Racial Equity": "y", "Beat Republicans": "z"})
+    assert worked_examples(small).count("Message:") == 1